@@ -1,16 +1,38 @@
 #!/usr/bin/env python3
 import os
-import json
+import functools
 import time
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import orjson
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import (
+    FileSystemEventHandler,
+    FileModifiedEvent, FileDeletedEvent, FileMovedEvent, FileCreatedEvent,
+    DirModifiedEvent, DirDeletedEvent, DirMovedEvent, DirCreatedEvent
+)
 
 # Local import
-from file_monitoring import MonitoredFile
+from file_monitoring import MonitoredFile, clear_owner_cache, checksum_scheme
 from alert_manager import AlertManager
 
+# Metadata fields compared between baseline and current state. "ino"
+# catches a file replaced by another one with identical content and
+# attributes; mtime_ns/ctime_ns only back the stat guard (ctime moves on
+# every chmod, and last_modified already reports mtime)
+METADATA_KEYS = ("size", "permissions", "owner", "group", "last_modified", "checksum", "ino")
+
+# Context-specific report text: event -> (interpretation, recommendation)
+_EVENT_TEMPLATES = {
+    "modify": ("File content or metadata was modified", "Review changes and verify legitimacy"),
+    "delete": ("File was deleted from filesystem", "Restore from backup if unauthorized"),
+    "move": ("File was moved or renamed", "Verify new location and update monitoring"),
+    "add": ("New file was created", "Verify file origin and legitimacy")
+}
+_UNKNOWN_EVENT_TEMPLATE = ("Unknown event type", "Manual investigation required")
+
 
 class FileWatcher:
     """
@@ -27,127 +49,256 @@ class FileWatcher:
         "add": ["created"]
     }
     
-    def __init__(self, monitored_files_path="/opt/vigilo/file_info.json", event_file_path="/opt/vigilo/file_event.json"):
+    # Watchdog event classes we react to. Passing them as event_filter
+    # narrows the inotify mask, so open/close-nowrite noise from unrelated
+    # files in a watched directory never reaches user space
+    FILE_EVENT_FILTER = [FileModifiedEvent, FileDeletedEvent, FileMovedEvent, FileCreatedEvent]
+    DIR_EVENT_FILTER = [DirModifiedEvent, DirDeletedEvent, DirMovedEvent, DirCreatedEvent]
+    
+    # Background log writer batching (max records / max wait in seconds)
+    LOG_BATCH_SIZE = 64
+    LOG_BATCH_TIMEOUT = 0.1
+    
+    # Filtered watchdog events are handed to a worker thread in batches of
+    # up to EVENT_BATCH_SIZE or EVENT_BATCH_TIMEOUT seconds
+    EVENT_BATCH_SIZE = 64
+    EVENT_BATCH_TIMEOUT = 0.1
+    
+    # Delay used to coalesce save_event_file() requests (seconds)
+    EVENT_FILE_FLUSH_INTERVAL = 0.2
+    
+    # How often start() checks for a stop() request (seconds)
+    SHUTDOWN_POLL_INTERVAL = 0.5
+    
+    # Email/remote alerts raised within ALERT_BATCH_WINDOW seconds of the
+    # first pending one are sent as a single message (at most
+    # ALERT_BATCH_MAX reports each); a window of 0 sends every alert alone
+    BATCHED_ALERT_MODES = frozenset(("email", "remote"))
+    ALERT_BATCH_WINDOW = 5.0
+    ALERT_BATCH_MAX = 50
+    
+    # Process-wide watcher returned by instance()
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    def __init__(self, monitored_files_path="/opt/vigilo/file_info.json", event_file_path="/opt/vigilo/file_event.json",
+                 alert_batch_window=None, alert_batch_max=None):
         
         self.monitored_files_path = monitored_files_path
         self.event_file_path = event_file_path
 
         # Thread safety: Lock for write operations
         self.write_lock = threading.Lock()
+        # Serializes cache writers only. Readers never lock: writers build a
+        # new dict and swap the reference, so readers always see a complete
+        # snapshot (reference assignment is atomic in CPython)
         self.cache_lock = threading.Lock()
 
         # Performance: Cache baseline states in memory
-        self.baseline_cache = {}  
-        # Load monitored files configuration
-        self.monitored = self.load_files_monitored()
-        # Load baselines
-        self.load_all_baselines()   
+        self.baseline_cache = {}
+        self.monitored = {}
+        # Basenames of monitored paths: cheap pre-filter for directory events
+        self._monitored_basenames = frozenset()
+        # Load monitored files configuration and baselines in one pass
+        self._load_config_once()
         # Watchdog observer for filesystem events
         self.observer = Observer()
+        
+        # Hashing and comparison run on a worker thread so the observer
+        # thread only filters and enqueues (started by start())
+        self._event_queue = queue.SimpleQueue()
+        self._event_worker = threading.Thread(
+            target=self._event_worker_loop,
+            name="vigilo-event-worker",
+            daemon=True
+        )
+        
+        # Alert history and database updates are persisted off the event path
+        self._log_queue = queue.SimpleQueue()
+        self._log_writer = threading.Thread(
+            target=self._log_writer_loop,
+            name="vigilo-log-writer",
+            daemon=True
+        )
+        self._log_writer.start()
+        
+        # Alert delivery (SMTP/HTTP can take seconds) runs on a small bounded
+        # pool so slow channels never stall event processing. Four reused
+        # threads are enough: bursts are grouped by _queue_alert(), SMTP
+        # sends are serialized on one pooled connection anyway, and HTTP
+        # goes through a keep-alive session, so an event loop would not
+        # send any faster
+        self._alert_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="alert")
+        
+        # Pending batched alerts: alert mode -> reports, flushed by a timer
+        self.alert_batch_window = self.ALERT_BATCH_WINDOW if alert_batch_window is None else alert_batch_window
+        self.alert_batch_max = self.ALERT_BATCH_MAX if alert_batch_max is None else alert_batch_max
+        self._alert_batch = {}
+        self._alert_batch_lock = threading.Lock()
+        self._alert_timer = None
+        # Set by the final flush: the pool is about to shut down
+        self._alerts_closed = False
+        
+        # file_event.json rewrites are coalesced by a flush thread
+        self._dirty = threading.Event()
+        self._stopping = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._event_file_flush_loop,
+            name="vigilo-event-flusher",
+            daemon=True
+        )
+        self._flusher.start()
+        
+        # Set by stop() / request_reload(); plain attribute stores, safe
+        # from a signal handler
+        self._stop_requested = False
+        self._reload_requested = False
+        self._started = False
+    
+    @classmethod
+    def instance(cls, *args, **kwargs):
+        """
+        Return the process-wide watcher, creating it on the first call.
+        Arguments are passed to the constructor and ignored once the
+        watcher exists, so later callers (e.g. signal handlers) can simply
+        call FileWatcher.instance().
+        """
+        # Lock-free once created: never blocks inside a signal handler
+        watcher = cls._instance
+        if watcher is not None:
+            return watcher
+        
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(*args, **kwargs)
+            return cls._instance
     
     # =========================================================================
     # INITIALIZATION & CONFIGURATION LOADING
     # =========================================================================
     
-    def load_files_monitored(self):
-        monitored = {}
-        
-        if not os.path.exists(self.monitored_files_path):
-            return monitored
+    @staticmethod
+    def _parse_jsonl(path):
+        """
+        Parse file_info.json in a single pass.
+        Returns:
+            dict: {path: record} for every valid entry
+        """
+        records = {}
         
         try:
-            with open(self.monitored_files_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    try:
-                        data = json.loads(line)
-                        path = data.get("file", {}).get("path")
-                        config = data.get("monitoring", {})
-                        
-                        if path and config:
-                            monitored[path] = config
-                    
-                    except json.JSONDecodeError:
-                        # Skip corrupted JSON entries
-                        continue
-                    except KeyError:
-                        # Skip malformed entries
-                        continue
-        
+            with open(path, "rb") as f:
+                raw = f.read()
         except (FileNotFoundError, PermissionError, OSError):
             # Cannot read database file
-            return {}
+            return records
         
-        return monitored
-    
-    def load_all_baselines(self):
-        if not os.path.exists(self.monitored_files_path):
-            return
-        
-        with self.cache_lock:
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            
             try:
-                with open(self.monitored_files_path, "r") as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        
-                        try:
-                            data = json.loads(line)
-                            path = data.get("file", {}).get("path")
-                            
-                            if path:
-                                self.baseline_cache[path] = data
-                        
-                        except json.JSONDecodeError:
-                            continue
+                data = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # Skip corrupted JSON entries
+                continue
             
-            except (FileNotFoundError, PermissionError, OSError):
-                pass
-    
-    def load_baseline(self, path):
+            file_path = data.get("file", {}).get("path") if isinstance(data, dict) else None
+            if file_path:
+                records[file_path] = data
+        
+        return records
     
-        # Try cache first (fast path)
-        with self.cache_lock:
-            if path in self.baseline_cache:
-                return self.baseline_cache[path]
+    @staticmethod
+    def _build_monitored(records):
+        """
+        Extract per-file monitoring configuration from parsed records.
+        Each config is completed with values precomputed for the event path:
+            _watch_events_set: frozenset of watched events
+            _alert_fn: resolved alert handler (None for log/silent)
+        """
+        monitored = {}
         
-        # Fallback: Read from file (slow path)
-        # This only happens if cache is stale or corrupted
-        if not os.path.exists(self.monitored_files_path):
-            return None
+        for path, data in records.items():
+            config = data.get("monitoring", {})
+            if config:
+                config = dict(config)
+                config["_watch_events_set"] = frozenset(config.get("watch_events", ()))
+                config["_alert_fn"] = AlertManager.get_handler(config.get("alert_mode", "log"))
+                monitored[path] = config
         
-        try:
-            with open(self.monitored_files_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    try:
-                        data = json.loads(line)
-                        if data.get("file", {}).get("path") == path:
-                            # Update cache for next time
-                            with self.cache_lock:
-                                self.baseline_cache[path] = data
-                            return data
-                    
-                    except json.JSONDecodeError:
-                        continue
+        return monitored
+    
+    def load_files_monitored(self):
+        return self._build_monitored(self._parse_jsonl(self.monitored_files_path))
+    
+    def load_all_baselines(self):
+        baselines = self._parse_jsonl(self.monitored_files_path)
         
-        except (FileNotFoundError, PermissionError, OSError):
-            pass
+        with self.cache_lock:
+            new_cache = dict(self.baseline_cache)
+            new_cache.update(baselines)
+            self.baseline_cache = new_cache
+    
+    def _load_config_once(self):
+        """
+        Populate monitored configuration and baseline cache from a single
+        read of file_info.json.
+        """
+        records = self._parse_jsonl(self.monitored_files_path)
+        monitored = self._build_monitored(records)
+        basenames = frozenset(os.path.basename(path) for path in monitored)
         
-        return None
+        # Swap in fresh snapshots; no reader-side locking required
+        with self.cache_lock:
+            self.monitored = monitored
+            self._monitored_basenames = basenames
+            self.baseline_cache = records
+    
+    def load_baseline(self, path):
+        # The cache is fully populated by load_all_baselines(), so a miss
+        # means the path has no baseline
+        return self.baseline_cache.get(path)
     
     # =========================================================================
     # FILE EVENT INDEX MANAGEMENT
     # =========================================================================
     
     def save_event_file(self):
+        """
+        Request a rewrite of file_event.json.
+        Requests are coalesced: the flush thread performs a single rewrite
+        EVENT_FILE_FLUSH_INTERVAL seconds after the first pending request.
+        """
+        self._dirty.set()
+    
+    def _event_file_flush_loop(self):
+        """
+        Background flusher for save_event_file() requests.
+        """
+        while not self._stopping.is_set():
+            if not self._dirty.wait(timeout=1.0):
+                continue
+            
+            # Let further requests pile up, then write once
+            self._stopping.wait(self.EVENT_FILE_FLUSH_INTERVAL)
+            self._dirty.clear()
+            self._write_event_file()
+    
+    def _stop_event_file_flusher(self):
+        """
+        Stop the flush thread, writing any pending request first.
+        """
+        self._stopping.set()
+        
+        if self._flusher.is_alive():
+            self._flusher.join()
+        
+        if self._dirty.is_set():
+            self._dirty.clear()
+            self._write_event_file()
+    
+    def _write_event_file(self):
         
         monitored = self.load_files_monitored()
         
@@ -164,19 +315,18 @@ class FileWatcher:
             temp_path = self.event_file_path + ".tmp"
             
             try:
-                with open(temp_path, "w") as f:
-                    json.dump(index_file, f, indent=4)
+                with open(temp_path, "wb") as f:
+                    f.write(orjson.dumps(index_file))
                 
                 # Atomic rename (POSIX guarantees atomicity)
                 os.replace(temp_path, self.event_file_path)
             
             except (OSError, IOError) as e:
                 # Clean up temp file on error
-                if os.path.exists(temp_path):
-                    try:
-                        os.remove(temp_path)
-                    except OSError:
-                        pass
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass  # Already gone (FileNotFoundError) or not removable
     
     # =========================================================================
     # METADATA COMPARISON
@@ -184,22 +334,32 @@ class FileWatcher:
     
     @staticmethod
     def compare_metadata(old, new):
-      
-        changes = {}
         
         # Only compare metadata section (ignore file/monitoring sections)
         old_meta = old.get("metadata", {})
         new_meta = new.get("metadata", {})
         
-        for key in old_meta:
-            old_value = old_meta.get(key)
-            new_value = new_meta.get(key)
-            
-            if old_value != new_value:
-                changes[key] = {
-                    "before": old_value,
-                    "after": new_value
-                }
+        # Fast path: nothing changed (the common case for spurious events)
+        if old_meta == new_meta:
+            return {}
+        
+        changes = {
+            key: {
+                "before": old_meta.get(key),
+                "after": new_meta.get(key)
+            }
+            for key in METADATA_KEYS
+            # Keys the baseline never recorded (e.g. "ino" in baselines
+            # from older versions) have nothing to compare against
+            if key in old_meta
+            and old_meta[key] != new_meta.get(key)
+        }
+        
+        # Digests of different schemes (e.g. sha256 baseline, blake3 now
+        # that it is installed) say nothing about the content
+        old_sum, new_sum = old_meta.get("checksum"), new_meta.get("checksum")
+        if old_sum and new_sum and checksum_scheme(old_sum) != checksum_scheme(new_sum):
+            changes.pop("checksum", None)
         
         return changes
     
@@ -212,6 +372,14 @@ class FileWatcher:
         Internal handler for watchdog events.
         """
         
+        # Watchdog event type -> user-friendly event name
+        _EVENT_MAP = {
+            "modified": "modify",
+            "deleted": "delete",
+            "created": "add",
+            "moved": "move"
+        }
+        
         def __init__(self, parent):
             super().__init__()
             self.parent = parent
@@ -220,6 +388,11 @@ class FileWatcher:
             """
             Intercept all filesystem events and filter by configuration.
             """
+            # Most events in a watched directory concern unrelated files:
+            # reject them on the basename before any path normalization
+            if os.path.basename(event.src_path) not in self.parent._monitored_basenames:
+                return
+            
             # Normalize path for consistent lookup
             path = os.path.abspath(event.src_path)
             
@@ -229,23 +402,13 @@ class FileWatcher:
             
             # Get user configuration for this file
             cfg = self.parent.monitored[path]
-            user_events = cfg.get("watch_events", [])
             
             # Map watchdog event type to our simplified types
-            event_type = None
-            
-            if event.event_type == "modified":
-                event_type = "modify"
-            elif event.event_type == "deleted":
-                event_type = "delete"
-            elif event.event_type == "created":
-                event_type = "add"
-            elif event.event_type == "moved":
-                event_type = "move"
+            event_type = self._EVENT_MAP.get(event.event_type)
             
             # Only process if user wants this event type
-            if event_type and event_type in user_events:
-                self.parent.handle_event(event_type, path)
+            if event_type and event_type in cfg["_watch_events_set"]:
+                self.parent._event_queue.put((event_type, path))
     
     # =========================================================================
     # EVENT PROCESSING
@@ -263,9 +426,10 @@ class FileWatcher:
             print("⚠️  No baseline found for this file")
             return
         
-        # Get current state
+        # Get current state (checksum reused if the stat guard says the
+        # content is unchanged)
         file_obj = MonitoredFile(path)
-        new_state = file_obj.get_current_info()
+        new_state = file_obj.get_current_info(prev=old_state.get("metadata"))
         
         # Compare metadata
         changes = self.compare_metadata(old_state, new_state)
@@ -275,71 +439,233 @@ class FileWatcher:
             return
         
         # Get alert configuration
-        alert_mode = self.monitored.get(path, {}).get("alert_mode", "log")
+        cfg = self.monitored.get(path, {})
+        alert_mode = cfg.get("alert_mode", "log")
+        alert_fn = cfg.get("_alert_fn")
         
         # Build alert report
+        metadata = new_state.get("metadata", {})
+        interpretation, recommendation = _EVENT_TEMPLATES.get(user_event, _UNKNOWN_EVENT_TEMPLATE)
+        
         report = {
             "File": path,
             "Event": user_event,
             "Time": datetime.now().isoformat(),
             "AlertMode": alert_mode,
-            "Owner": new_state.get("metadata", {}).get("owner", "unknown"),
-            "Permissions": new_state.get("metadata", {}).get("permissions", "unknown"),
+            "Owner": metadata.get("owner", "unknown"),
+            "Permissions": metadata.get("permissions", "unknown"),
             "Changes": changes,
-            "Interpretation": "",
-            "Recommendation": ""
+            "Interpretation": interpretation,
+            "Recommendation": recommendation
         }
         
-        # Add context-specific interpretation
-        if user_event == "modify":
-            report["Interpretation"] = "File content or metadata was modified"
-            report["Recommendation"] = "Review changes and verify legitimacy"
-        
-        elif user_event == "delete":
-            report["Interpretation"] = "File was deleted from filesystem"
-            report["Recommendation"] = "Restore from backup if unauthorized"
-        
-        elif user_event == "move":
-            report["Interpretation"] = "File was moved or renamed"
-            report["Recommendation"] = "Verify new location and update monitoring"
+        # Dispatch alert (non-blocking)
+        if alert_fn:
+            self._queue_alert(report, alert_mode, alert_fn)
+        
+        # Update cache right away so the next event compares against the
+        # new state (copy-on-write snapshot)
+        if user_event == "delete":
+            with self.cache_lock:
+                new_cache = dict(self.baseline_cache)
+                new_cache.pop(path, None)
+                self.baseline_cache = new_cache
+        else:
+            # Reload baseline into cache
+            if os.path.exists(path):
+                new_baseline = file_obj.get_current_info(prev=new_state.get("metadata"))
+                new_baseline["monitoring"] = old_state.get("monitoring", {})
+                
+                with self.cache_lock:
+                    new_cache = dict(self.baseline_cache)
+                    new_cache[path] = new_baseline
+                    self.baseline_cache = new_cache
         
-        elif user_event == "add":
-            report["Interpretation"] = "New file was created"
-            report["Recommendation"] = "Verify file origin and legitimacy"
+        # Save to alert history log and update database state in background
+        self._log_queue.put((report, user_event, path))
+    
+    # =========================================================================
+    # ALERT BATCHING
+    # =========================================================================
+    
+    def _queue_alert(self, report, alert_mode, alert_fn):
+        """
+        Send an alert now, or hold it for the next batch of its mode.
+        """
+        if self.alert_batch_window <= 0 or alert_mode not in self.BATCHED_ALERT_MODES:
+            self._submit_alert(alert_fn, report)
+            return
         
-        else:
-            report["Interpretation"] = "Unknown event type"
-            report["Recommendation"] = "Manual investigation required"
+        with self._alert_batch_lock:
+            pending = self._alert_batch.setdefault(alert_mode, [])
+            pending.append(report)
+            
+            if len(pending) >= self.alert_batch_max:
+                self._submit_alert(AlertManager.dispatch_batch, self._alert_batch.pop(alert_mode), alert_mode)
+            elif self._alert_timer is None and not self._alerts_closed:
+                self._alert_timer = threading.Timer(self.alert_batch_window, self._flush_alerts)
+                self._alert_timer.daemon = True
+                self._alert_timer.start()
+    
+    def _flush_alerts(self, final=False):
+        """
+        Send all pending alert batches (timer callback, also run on shutdown).
+        Batches are submitted under _alert_batch_lock, so a timer firing
+        during shutdown either submits before the final flush or finds
+        nothing left to send.
+        Args:
+            final (bool): Last flush before the alert pool shuts down
+        """
+        with self._alert_batch_lock:
+            batches, self._alert_batch = self._alert_batch, {}
+            timer, self._alert_timer = self._alert_timer, None
+            
+            for alert_mode, reports in batches.items():
+                self._submit_alert(AlertManager.dispatch_batch, reports, alert_mode)
+            
+            if final:
+                self._alerts_closed = True
+        
+        # Joined outside the lock: a timer that already fired may be
+        # waiting for it
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+            if final:
+                timer.join()
+    
+    def _submit_alert(self, fn, *args):
+        """
+        Hand an alert to the pool, unless the pool is shut down.
+        """
+        if self._alerts_closed:
+            print("⚠️  Alert dropped: monitoring service is stopping")
+            return
         
-        # Save to alert history log
-        from logger import save_log_history
-        save_log_history(report)
+        try:
+            self._alert_pool.submit(fn, *args)
+        except RuntimeError:
+            # Pool already shut down
+            print("⚠️  Alert dropped: monitoring service is stopping")
+    
+    # =========================================================================
+    # BACKGROUND EVENT WORKER
+    # =========================================================================
+    
+    def _event_worker_loop(self):
+        """
+        Run handle_event() for queued watchdog events.
+        Events are drained in batches of up to EVENT_BATCH_SIZE or
+        EVENT_BATCH_TIMEOUT seconds. A None item stops the loop.
+        """
+        running = True
         
-        # Dispatch alert (non-blocking)
-        AlertManager.dispatch(report, alert_mode)
+        while running:
+            batch = [self._event_queue.get()]
+            deadline = time.monotonic() + self.EVENT_BATCH_TIMEOUT
+            
+            while len(batch) < self.EVENT_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._event_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            
+            previous = None
+            
+            for item in batch:
+                if item is None:
+                    running = False
+                    continue
+                
+                # A burst of identical events (e.g. several writes) needs a
+                # single comparison: handle_event reads the current state
+                if item == previous:
+                    continue
+                previous = item
+                
+                try:
+                    self.handle_event(*item)
+                except Exception as e:
+                    # Never let one bad event kill the worker thread
+                    print(f"⚠️  Error handling event for {item[1]}: {e}")
+    
+    def _stop_event_worker(self):
+        """
+        Process pending events and stop the worker.
+        """
+        if self._event_worker.is_alive():
+            self._event_queue.put(None)
+            self._event_worker.join()
+    
+    # =========================================================================
+    # BACKGROUND LOG WRITER
+    # =========================================================================
+    
+    def _log_writer_loop(self):
+        """
+        Persist queued reports and database state updates.
+        Records are drained in batches of up to LOG_BATCH_SIZE or
+        LOG_BATCH_TIMEOUT seconds. A None item stops the loop.
+        """
+        from logger import save_log_history, update_files_state
         
-        # Update database state
-        from logger import update_files_state
+        running = True
         
-        with self.write_lock:
-            update_files_state(
-                file_info_path=self.monitored_files_path,
-                file_event_path=self.event_file_path,
-                event_type=user_event,
-                src_path=path
-            )
+        while running:
+            batch = [self._log_queue.get()]
+            deadline = time.monotonic() + self.LOG_BATCH_TIMEOUT
             
-            # Update cache after database write
-            if user_event == "delete":
-                with self.cache_lock:
-                    self.baseline_cache.pop(path, None)
-            else:
-                # Reload baseline into cache
-                if os.path.exists(path):
-                    with self.cache_lock:
-                        new_baseline = file_obj.get_current_info()
-                        new_baseline["monitoring"] = old_state.get("monitoring", {})
-                        self.baseline_cache[path] = new_baseline
+            while len(batch) < self.LOG_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._log_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            
+            state_updates = []
+            
+            for item in batch:
+                if item is None:
+                    running = False
+                    continue
+                
+                report, user_event, path = item
+                
+                try:
+                    save_log_history(report)
+                except Exception as e:
+                    # Never let a write error kill the writer thread
+                    print(f"⚠️  Error saving alert for {path}: {e}")
+                
+                # Repeated events on the same file collapse into one rewrite:
+                # update_files_state re-reads the file's current state anyway
+                if not state_updates or state_updates[-1] != (user_event, path):
+                    state_updates.append((user_event, path))
+            
+            for user_event, path in state_updates:
+                try:
+                    with self.write_lock:
+                        update_files_state(
+                            file_info_path=self.monitored_files_path,
+                            file_event_path=self.event_file_path,
+                            event_type=user_event,
+                            src_path=path
+                        )
+                
+                except Exception as e:
+                    print(f"⚠️  Error updating state for {path}: {e}")
+    
+    def _stop_log_writer(self):
+        """
+        Flush pending records and stop the background writer.
+        """
+        if self._log_writer.is_alive():
+            self._log_queue.put(None)
+            self._log_writer.join()
     
     # =========================================================================
     # MAIN MONITORING LOOP
@@ -348,58 +674,168 @@ class FileWatcher:
     def start(self):
         """
         Start the file monitoring service.
+        A watcher runs at most once; further calls return immediately.
         """
+        if self._started:
+            print("⚠️  Monitoring service already started")
+            return
+        self._started = True
+        
         print("File Monitoring Service Started")
         print(f" Monitoring {len(self.monitored)} file(s)")
         
-        # Collect unique parent directories to watch
-        paths_to_watch = set()
-        for path in self.monitored:
-            parent_dir = os.path.dirname(path)
-            if os.path.exists(parent_dir):
-                paths_to_watch.add(parent_dir)
+        # Collect unique parent directories to watch (one stat per directory)
+        parents = {os.path.dirname(path) for path in self.monitored}
+        paths_to_watch = {d for d in parents if os.path.isdir(d)}
+        
+        # Each directory costs one inotify watch (~1 KiB of kernel memory)
+        # against the per-user limit shared with every other inotify user
+        limit = inotify_watch_limit()
+        if limit is not None and len(paths_to_watch) > limit // 2:
+            print(f"⚠️ Watching {len(paths_to_watch)} directories, "
+                  f"fs.inotify.max_user_watches is {limit}")
+        
+        # Trade memory for burst tolerance: drain up to 256 KiB of inotify
+        # events per read() and report moves without the 0.5s pairing delay
+        tune_inotify_backend()
         
         # Create event handler
         handler = FileWatcher.Handler(self)
         
+        # Directories holding a monitored sub-directory also need Dir* events
+        dirs_with_subdirs = {
+            os.path.dirname(path)
+            for path, data in self.baseline_cache.items()
+            if data.get("file", {}).get("type") == "directory"
+        }
+        
         # Install watchers on each directory
         for path in paths_to_watch:
+            event_filter = self.FILE_EVENT_FILTER
+            if path in dirs_with_subdirs:
+                event_filter = self.FILE_EVENT_FILTER + self.DIR_EVENT_FILTER
+            
             try:
-                self.observer.schedule(handler, path, recursive=False)
+                self.observer.schedule(handler, path, recursive=False, event_filter=event_filter)
                 print(f"Watching: {path}")
             except (OSError, IOError) as e:
                 print(f"⚠️ Cannot watch {path}: {e}")
         
-        # Start watchdog observer
+        # Start the event worker, then the watchdog observer
+        self._event_worker.start()
         self.observer.start()
         
         print(" Monitoring active. Press CTRL+C to stop.")
         
         try:
-            # Keep alive until interrupted
-            while True:
-                time.sleep(1)
+            # Keep alive until stop() or CTRL+C, reloading when asked
+            while not self._stop_requested:
+                time.sleep(self.SHUTDOWN_POLL_INTERVAL)
+                
+                if self._reload_requested:
+                    self._reload_requested = False
+                    try:
+                        reload_watcher_config(self)
+                    except Exception as e:
+                        print(f"⚠️  Configuration reload failed: {e}")
         
         except KeyboardInterrupt:
             print("\n Shutting down monitoring service...")
-            self.observer.stop()
         
-        # Wait for all watchdog threads to finish
-        self.observer.join()
-        print("Service stopped cleanly")
+        finally:
+            self.observer.stop()
+            
+            # Wait for all watchdog threads to finish
+            self.observer.join()
+            
+            # Finish queued events, then flush history and database writes
+            self._stop_event_worker()
+            self._stop_log_writer()
+            self._stop_event_file_flusher()
+            
+            # Send held alert batches and let in-flight alerts finish
+            self._flush_alerts(final=True)
+            self._alert_pool.shutdown(wait=True)
+            print("Service stopped cleanly")
+    
+    def stop(self):
+        """
+        Ask start() to shut down.
+        Only sets a flag, so it is safe to call from a signal handler or
+        another thread; start() performs the cleanup in its own thread.
+        """
+        self._stop_requested = True
+    
+    def request_reload(self):
+        """
+        Ask start() to run reload_watcher_config() (e.g. on SIGHUP).
+        Only sets a flag, like stop().
+        """
+        self._reload_requested = True
 
 
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
 
+# inotify read buffer size in bytes. watchdog's Inotify.read_events()
+# defaults to event_buffer_size=81920 (80 KiB, roughly 2500 events with
+# short names); 256 KiB drains about 3x more of a burst per read()
+INOTIFY_BUFFER_SIZE = 1 << 18
+
+_inotify_tuned = False
+
+
+def tune_inotify_backend():
+    """
+    Tune watchdog's inotify backend for event bursts.
+
+    - Reads events in INOTIFY_BUFFER_SIZE chunks so a burst is drained in
+      fewer read() calls before the kernel queue overflows
+    - Disables the 0.5s buffering of unmatched IN_MOVED_FROM events. A move
+      whose halves land in different reads is then reported as a deletion:
+      it is alerted on only if "delete" is in the file's watch_events, and
+      dropped otherwise, even when "move" is watched.
+    Must be called before the observer creates its emitters.
+    """
+    global _inotify_tuned
+    
+    if _inotify_tuned:
+        return
+    
+    try:
+        from watchdog.observers import inotify_buffer, inotify_c
+    except ImportError:
+        # Not on Linux, watchdog uses another backend
+        return
+    
+    inotify_buffer.InotifyBuffer.delay = 0
+    inotify_c.Inotify.read_events = functools.partialmethod(
+        inotify_c.Inotify.read_events,
+        event_buffer_size=INOTIFY_BUFFER_SIZE
+    )
+    _inotify_tuned = True
+
+
+def inotify_watch_limit():
+    """
+    Read the per-user inotify watch limit.
+    Returns:
+        int: fs.inotify.max_user_watches, or None if unavailable
+    """
+    try:
+        with open("/proc/sys/fs/inotify/max_user_watches") as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+
 def reload_watcher_config(watcher):
     """
     Hot-reload configuration without restarting the watcher.
       """
-    with watcher.cache_lock:
-        watcher.monitored = watcher.load_files_monitored()
-        watcher.baseline_cache.clear()
-        watcher.load_all_baselines()
+    watcher._load_config_once()
+    AlertManager.get_available_modes.cache_clear()
+    clear_owner_cache()
     
     print("🔄 Configuration reloaded")
\ No newline at end of file
@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
-import subprocess
-import shlex
+import shutil
+import functools
 import os
 import json
+import threading
 from datetime import datetime
+import orjson
+
+# Every alert mode accepted on the command line
+VALID_ALERT_MODES = frozenset({"system", "log", "email", "remote", "silent"})
 
 
 class AlertManager:
@@ -11,6 +16,14 @@ class AlertManager:
     Central dispatcher for all alert types.
     """
     
+    # Pooled connections, reused across alerts (created lazily)
+    _http_session = None
+    _http_lock = threading.Lock()
+    _smtp_conn = None
+    _smtp_lock = threading.Lock()
+    _dbus_conn = None
+    _dbus_lock = threading.Lock()
+    
     # =========================================================================
     # MAIN DISPATCH ROUTER
     # =========================================================================
@@ -26,27 +39,43 @@ class AlertManager:
         if not isinstance(alert_mode, str):
             return
         
-        # Route to appropriate handler
-        if alert_mode == "system":
-            AlertManager.system_notification(report)
-        
-        elif alert_mode == "log":
-            # Already handled by save_log_history in FileWatcher
-            pass
-        
-        elif alert_mode == "email":
-            AlertManager.email_notification(report)
-        
-        elif alert_mode == "remote":
-            AlertManager.remote_notification(report)
+        # Route to appropriate handler (unknown modes fail silently)
+        handler = AlertManager._HANDLERS.get(alert_mode)
+        if handler:
+            handler(report)
+    
+    @staticmethod
+    def get_handler(alert_mode):
+        """
+        Resolve the notification handler for an alert mode.
+        Callers on a hot path can resolve once and call the handler directly.
+        Returns:
+            callable: handler(report), or None when nothing is sent
+        """
+        return AlertManager._HANDLERS.get(alert_mode)
+    
+    @staticmethod
+    def dispatch_batch(reports, alert_mode):
+        """
+        Send several reports for one alert mode.
+        Modes with a batch handler (email, remote) send a single summary
+        message; the others get one notification per report.
+        Args:
+            reports (list): Alert reports, oldest first
+            alert_mode (str): Mode shared by all reports
+        """
+        if not reports:
+            return
         
-        elif alert_mode == "silent":
-            # Explicitly do nothing
-            pass
+        batch_handler = AlertManager._BATCH_HANDLERS.get(alert_mode)
+        if batch_handler and len(reports) > 1:
+            batch_handler(reports)
+            return
         
-        else:
-            # Unknown alert mode, fail silently
-            pass
+        handler = AlertManager._HANDLERS.get(alert_mode)
+        if handler:
+            for report in reports:
+                handler(report)
     
     # =========================================================================
     # SYSTEM NOTIFICATIONS (Linux Desktop)
@@ -96,16 +125,23 @@ class AlertManager:
         if len(message) > 500:
             message = message[:497] + "..."
         
-        # Send notification
+        # Preferred: direct D-Bus call, no process spawn per alert
+        if AlertManager._dbus_notify(title, message):
+            return
+        
+        # Fallback: notify-send
+        import subprocess
+        
         try:
-            # Security: Quote all arguments to prevent injection
+            # Security: argv list without a shell, arguments reach execve
+            # unmodified so no quoting is needed (or wanted)
             subprocess.run(
                 [
                     "notify-send",
                     "--urgency=normal",
                     "--icon=dialog-warning",
-                    shlex.quote(title),
-                    shlex.quote(message)
+                    title,
+                    message
                 ],
                 check=False,  # Don't raise on non-zero exit
                 timeout=5,    # Kill after 5 seconds if hanging
@@ -126,6 +162,52 @@ class AlertManager:
             # Never crash the watcher
             pass
     
+    @staticmethod
+    def _dbus_notify(title, message):
+        """
+        Send a desktop notification through org.freedesktop.Notifications
+        on the session bus (requires the optional 'jeepney' package).
+        Returns:
+            bool: True if delivered, False if D-Bus is unavailable
+        """
+        try:
+            from jeepney import DBusAddress, new_method_call
+            from jeepney.io.blocking import open_dbus_connection
+        except ImportError:
+            return False
+        
+        notifications = DBusAddress(
+            "/org/freedesktop/Notifications",
+            bus_name="org.freedesktop.Notifications",
+            interface="org.freedesktop.Notifications"
+        )
+        
+        # Notify(app_name, replaces_id, icon, summary, body, actions, hints, timeout)
+        msg = new_method_call(
+            notifications,
+            "Notify",
+            "susssasa{sv}i",
+            ("Vigilo", 0, "dialog-warning", title, message, [], {"urgency": ("y", 1)}, -1)
+        )
+        
+        with AlertManager._dbus_lock:
+            try:
+                if AlertManager._dbus_conn is None:
+                    AlertManager._dbus_conn = open_dbus_connection(bus="SESSION")
+                
+                AlertManager._dbus_conn.send_and_get_reply(msg, timeout=5)
+                return True
+            
+            except Exception:
+                # No session bus or notification daemon: reconnect next time
+                if AlertManager._dbus_conn is not None:
+                    try:
+                        AlertManager._dbus_conn.close()
+                    except Exception:
+                        pass
+                    AlertManager._dbus_conn = None
+                return False
+    
     # =========================================================================
     # EMAIL NOTIFICATIONS
     # =========================================================================
@@ -134,24 +216,30 @@ class AlertManager:
     def email_notification(report):
         """Send alert via email"""
         
-        import smtplib
-        from email.mime.text import MIMEText
-        from email.mime.multipart import MIMEMultipart
+        # Build email
+        subject = f"🚨 Vigilo Alert: {report.get('Event')} on {os.path.basename(report.get('File', 'unknown'))}"
+        body = AlertManager._email_report_body(report)
+        body += "\n\n---\nVigilo File Integrity Monitoring"
         
-        # Get SMTP config from environment
-        smtp_host = os.environ.get("SMTP_HOST")
-        smtp_port = int(os.environ.get("SMTP_PORT", 587))
-        smtp_user = os.environ.get("SMTP_USER")
-        smtp_pass = os.environ.get("SMTP_PASS")
-        to_email = os.environ.get("ALERT_EMAIL_TO")
+        AlertManager._send_email(subject, body)
+    
+    @staticmethod
+    def email_batch_notification(reports):
+        """Send several alerts as one email"""
         
-        if not all([smtp_host, smtp_user, smtp_pass, to_email]):
-            print("⚠️  Email not configured (missing SMTP env vars)")
-            return
+        files = {report.get('File', 'unknown') for report in reports}
+        subject = f"🚨 Vigilo Alert: {len(reports)} events on {len(files)} file(s)"
         
-        # Build email
-        subject = f"🚨 Vigilo Alert: {report.get('Event')} on {os.path.basename(report.get('File', 'unknown'))}"
+        body = "\n\n".join(AlertManager._email_report_body(report) for report in reports)
+        body += "\n\n---\nVigilo File Integrity Monitoring"
         
+        AlertManager._send_email(subject, body)
+    
+    @staticmethod
+    def _email_report_body(report):
+        """
+        Plain-text email section describing one report.
+        """
         body = f"""
                 File Integrity Monitoring Alert
 
@@ -173,7 +261,27 @@ class AlertManager:
         
         body += f"\n\nInterpretation: {report.get('Interpretation', 'N/A')}"
         body += f"\nRecommendation: {report.get('Recommendation', 'N/A')}"
-        body += "\n\n---\nVigilo File Integrity Monitoring"
+        return body
+    
+    @staticmethod
+    def _send_email(subject, body):
+        """
+        Send a plain-text email over the pooled SMTP connection.
+        """
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        
+        # Get SMTP config from environment
+        smtp_host = os.environ.get("SMTP_HOST")
+        smtp_port = int(os.environ.get("SMTP_PORT", 587))
+        smtp_user = os.environ.get("SMTP_USER")
+        smtp_pass = os.environ.get("SMTP_PASS")
+        to_email = os.environ.get("ALERT_EMAIL_TO")
+        
+        if not all([smtp_host, smtp_user, smtp_pass, to_email]):
+            print("⚠️  Email not configured (missing SMTP env vars)")
+            return
         
         # Create message
         msg = MIMEMultipart()
@@ -182,24 +290,78 @@ class AlertManager:
         msg['Subject'] = subject
         msg.attach(MIMEText(body, 'plain'))
         
-        # Send
+        # Send over the pooled connection (serialized by _smtp_lock)
         try:
-            with smtplib.SMTP(smtp_host, smtp_port, timeout=10) as server:
-                server.starttls()
-                server.login(smtp_user, smtp_pass)
-                server.send_message(msg)
+            with AlertManager._smtp_lock:
+                try:
+                    server = AlertManager._get_smtp_connection(smtp_host, smtp_port, smtp_user, smtp_pass)
+                    server.send_message(msg)
+                
+                except smtplib.SMTPServerDisconnected:
+                    # Pooled connection went stale, reconnect once
+                    AlertManager._smtp_conn = None
+                    server = AlertManager._get_smtp_connection(smtp_host, smtp_port, smtp_user, smtp_pass)
+                    server.send_message(msg)
+            
             print(f"Email alert sent to {to_email}")
         
         except Exception as e:
+            AlertManager._close_smtp_connection()
             print(f"⚠️  Failed to send email: {e}")
     
+    @staticmethod
+    def _get_smtp_connection(smtp_host, smtp_port, smtp_user, smtp_pass):
+        """
+        Return the pooled SMTP connection, opening it (TLS + login) if needed.
+        Caller must hold _smtp_lock.
+        """
+        import smtplib
+        
+        if AlertManager._smtp_conn is None:
+            server = smtplib.SMTP(smtp_host, smtp_port, timeout=10)
+            try:
+                server.starttls()
+                server.login(smtp_user, smtp_pass)
+            except Exception:
+                server.close()
+                raise
+            AlertManager._smtp_conn = server
+        
+        return AlertManager._smtp_conn
+    
+    @staticmethod
+    def _close_smtp_connection():
+        """
+        Drop the pooled SMTP connection (next email reconnects).
+        """
+        with AlertManager._smtp_lock:
+            server = AlertManager._smtp_conn
+            AlertManager._smtp_conn = None
+        
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+    
     # =========================================================================
     # REMOTE NOTIFICATIONS
     # =========================================================================
     @staticmethod
     def remote_notification(report):
         """Send alert to remote monitoring server"""
-        
+        AlertManager._post_remote(report)
+    
+    @staticmethod
+    def remote_batch_notification(reports):
+        """Send several alerts to the remote server as one JSON array"""
+        AlertManager._post_remote(reports)
+    
+    @staticmethod
+    def _post_remote(payload):
+        """
+        POST a report (object) or batch of reports (array) as JSON.
+        """
         try:
             import requests
         except ImportError:
@@ -221,11 +383,11 @@ class AlertManager:
             "User-Agent": "Vigilo/1.0"
         }
         
-        # Send POST request
+        # Send POST request (pooled keep-alive session)
         try:
-            response = requests.post(
+            response = AlertManager._get_http_session().post(
                 url,
-                json=report,
+                data=orjson.dumps(payload),
                 headers=headers,
                 timeout=5,
                 verify=True  # Validate SSL cert
@@ -244,6 +406,24 @@ class AlertManager:
         
         except Exception as e:
             print(f"⚠️  Remote alert failed: {e}")
+    
+    @staticmethod
+    def _get_http_session():
+        """
+        Return the shared requests session (TCP keep-alive + TLS reuse).
+        """
+        with AlertManager._http_lock:
+            if AlertManager._http_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                AlertManager._http_session = session
+            
+            return AlertManager._http_session
    
     # =========================================================================
     # ALERT VALIDATION
@@ -251,25 +431,24 @@ class AlertManager:
     
     @staticmethod
     def validate_alert_mode(mode):
-        valid_modes = {"system", "log", "email", "remote", "silent"}
-        return mode in valid_modes
+        """Kept for callers; prefer `mode in VALID_ALERT_MODES`."""
+        return mode in VALID_ALERT_MODES
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_available_modes():
+        """
+        List alert modes usable on this host.
+        The result is cached; call get_available_modes.cache_clear() after
+        a configuration change.
+        Returns:
+            tuple: available mode names
+        """
         available = ["log", "silent"]
         
-        # Check if notify-send is available
-        try:
-            subprocess.run(
-                ["which", "notify-send"],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                timeout=1
-            )
+        # Check if notify-send is available (PATH scan, no fork)
+        if shutil.which("notify-send"):
             available.append("system")
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            pass
         
         # Check if email is configured
         smtp_configured = all([
@@ -289,7 +468,23 @@ class AlertManager:
         if remote_configured:
             available.append("remote")
         
-        return available
+        return tuple(available)
+
+
+# Alert mode -> handler table (defined once all handlers exist)
+AlertManager._HANDLERS = {
+    "system": AlertManager.system_notification,
+    "email": AlertManager.email_notification,
+    "remote": AlertManager.remote_notification,
+    "log": None,     # Already handled by save_log_history in FileWatcher
+    "silent": None   # Explicitly do nothing
+}
+
+# Alert mode -> handler sending many reports as one message
+AlertManager._BATCH_HANDLERS = {
+    "email": AlertManager.email_batch_notification,
+    "remote": AlertManager.remote_batch_notification
+}
 
 
 # =============================================================================
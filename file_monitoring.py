@@ -3,9 +3,45 @@ import os
 import stat
 import pwd
 import grp
-import json
 import hashlib
+import functools
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+import orjson
+
+try:
+    import blake3  # Optional: SIMD + multithreaded hashing
+except ImportError:
+    blake3 = None
+
+# Files larger than this are hashed as a tree of chunks on a thread pool
+PARALLEL_HASH_THRESHOLD = 64 << 20
+# Fixed so the digest does not depend on the core count of the host
+PARALLEL_HASH_CHUNK = 16 << 20
+# Kept small: the service unit caps the process at TasksMax=50
+PARALLEL_HASH_WORKERS = min(8, os.cpu_count() or 1)
+# Size of the reusable read buffer used when streaming file content
+HASH_READ_SIZE = 1 << 20
+# Fresh SHA-256 state; .copy() is cheaper than constructing a new one
+_SHA256_PROTO = hashlib.sha256()
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+# Paths that may never be monitored (prefix match)
+FORBIDDEN_PATHS = (
+    "/etc/shadow",
+    "/etc/passwd",
+    "/root/.ssh",
+    "/proc",
+    "/sys"
+)
+
+# Working directory, looked up on first use (nothing in Vigilo chdir()s)
+_cwd = None
 
 
 class MonitoredFile:
@@ -13,11 +49,15 @@ class MonitoredFile:
     Represents a file or directory under surveillance.
     """
     
-    def __init__(self, path):
+    def __init__(self, path, stat=None):
         """
         Initialize a MonitoredFile object.
+        Args:
+            path (str): File path
+            stat (os.stat_result): Stat already taken by the caller, used
+                by the next load_file_info() instead of a new os.stat()
         """
-        self.path = os.path.abspath(path)
+        self.path = absolute_path(path)
         
         # File metadata attributes
         self.type = None
@@ -27,38 +67,74 @@ class MonitoredFile:
         self.group = None
         self.permissions = None
         self.last_modified = None
+        self.ctime_ns = None
+        self.mtime_ns = None
+        self.ino = None
         self.checksum = None
+        
+        # Stat handed over by the caller for the next load_file_info()
+        self._stat = stat
     
     # =========================================================================
     # METADATA COLLECTION
     # =========================================================================
     
-    def file_type(self):
+    def file_type(self, mode=None):
         """
         Determine the type of the filesystem object.
+        Args:
+            mode (int): st_mode from an existing stat; stats the path if None
         """
-        if os.path.isfile(self.path):
+        if mode is None:
+            try:
+                mode = os.stat(self.path).st_mode
+            except OSError:
+                return "other"
+        
+        if stat.S_ISREG(mode):
             return "file"
-        elif os.path.isdir(self.path):
+        elif stat.S_ISDIR(mode):
             return "directory"
         else:
             return "other"
     
-    def compute_checksum(self):
+    def compute_checksum(self, scheme=None):
         """
-        Calculate SHA-256 checksum of the file content.
+        Calculate checksum of the file content.
+        
+        By default uses BLAKE3 when the optional 'blake3' package is
+        installed (stored as "blake3:<hex>"), SHA-256 otherwise.
+        Args:
+            scheme (str): Scheme to hash with, as returned by
+                checksum_scheme(), so a digest stays comparable with an
+                earlier one. Ignored if it cannot be computed here.
         """
         if self.type != "file":
             return None
         
-        sha = hashlib.sha256()
+        if scheme == "blake3" and blake3 is None:
+            scheme = None
+        if scheme is None:
+            scheme = self.default_checksum_scheme()
         
+        # Files are read into reused buffers, never mmap'd: a monitored
+        # file truncated mid-hash (e.g. logrotate copytruncate) would
+        # raise SIGBUS on a mapping and kill the service
         try:
-            with open(self.path, "rb") as f:
-                # Read in 4KB chunks to avoid loading entire file into memory
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha.update(chunk)
-            return sha.hexdigest()
+            if scheme == "blake3":
+                hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+                with open(self.path, "rb", buffering=0) as f:
+                    return "blake3:" + _hash_stream(f, hasher).hexdigest()
+            
+            if scheme == "tsha256":
+                return "tsha256:" + _parallel_sha256(self.path)
+            
+            with open(self.path, "rb", buffering=0) as f:
+                # Python 3.11+: hash in a C loop with the GIL released
+                if hasattr(hashlib, "file_digest"):
+                    return hashlib.file_digest(f, "sha256").hexdigest()
+                
+                return _hash_stream(f, _SHA256_PROTO.copy()).hexdigest()
         
         except FileNotFoundError:
             # File was deleted between type check and hash computation
@@ -72,35 +148,66 @@ class MonitoredFile:
             # Other OS-level errors (disk I/O, etc.)
             return None
     
-    def load_file_info(self):
+    def default_checksum_scheme(self):
+        """
+        Scheme used for content with no earlier checksum to match.
+        """
+        if blake3 is not None:
+            return "blake3"
+        if self.size is not None and self.size > PARALLEL_HASH_THRESHOLD:
+            return "tsha256"
+        return "sha256"
+    
+    def load_file_info(self, prev=None):
         """
         Collect all metadata about the monitored file.
+        Args:
+            prev (dict): Previously recorded metadata. If size, mtime,
+                inode and ctime are unchanged its checksum is reused
+                instead of rehashing the file (ctime cannot be reset
+                like mtime)
         Returns:
             dict: Structured metadata in JSON-compatible format
         """
+        # A given stat is only trusted once, later loads stat afresh
+        stats, self._stat = self._stat, None
+        
         try:
-            stats = os.stat(self.path)
+            if stats is None:
+                stats = os.stat(self.path)
         except (FileNotFoundError, PermissionError, OSError) as e:
             raise e
         
-        self.type = self.file_type()
+        self.type = self.file_type(stats.st_mode)
         self.file_name = os.path.basename(self.path)
         self.size = stats.st_size
         
-        # Safe owner/group resolution with fallback
-        try:
-            self.owner = pwd.getpwuid(stats.st_uid).pw_name
-        except KeyError:
-            self.owner = str(stats.st_uid)  # UID does not exist
-        
-        try:
-            self.group = grp.getgrgid(stats.st_gid).gr_name
-        except KeyError:
-            self.group = str(stats.st_gid)  # GID does not exist
+        # Owner/group resolution (cached NSS lookups)
+        self.owner = _uid_name(stats.st_uid)
+        self.group = _gid_name(stats.st_gid)
         
+        # stat.filemode is the C implementation from _stat (~150 ns/call)
         self.permissions = stat.filemode(stats.st_mode)
-        self.last_modified = datetime.fromtimestamp(stats.st_mtime).isoformat()
-        self.checksum = self.compute_checksum()
+        self.last_modified = _iso(stats.st_mtime)
+        self.ctime_ns = stats.st_ctime_ns
+        self.mtime_ns = stats.st_mtime_ns
+        self.ino = stats.st_ino
+        
+        # Stat guard: content cannot have changed, skip the hash
+        if (prev and self.type == "file"
+                and prev.get("size") == self.size
+                and prev.get("mtime_ns") == self.mtime_ns
+                and prev.get("ino") == self.ino
+                and prev.get("ctime_ns") == self.ctime_ns):
+            self.checksum = prev.get("checksum")
+        else:
+            # Same size: the content may be unchanged, so hash it with the
+            # previous scheme to keep the digests comparable. Installing or
+            # removing blake3 only switches files whose content changed
+            scheme = None
+            if prev and prev.get("checksum") and prev.get("size") == self.size:
+                scheme = checksum_scheme(prev["checksum"])
+            self.checksum = self.compute_checksum(scheme)
         
         return self.format_json()
     
@@ -124,6 +231,9 @@ class MonitoredFile:
                 "owner": self.owner,
                 "group": self.group,
                 "last_modified": self.last_modified,
+                "ctime_ns": self.ctime_ns,
+                "mtime_ns": self.mtime_ns,
+                "ino": self.ino,
                 "checksum": self.checksum
             }
         }
@@ -132,25 +242,34 @@ class MonitoredFile:
     # DATABASE OPERATIONS
     # =========================================================================
     
-    def save_initial_info(self, watch_event, alert_mode):
-        """Save initial file state to the monitoring database."""
-
-        data = self.load_file_info()
+    def save_initial_info(self, watch_event, alert_mode, data=None):
+        """
+        Save initial file state to the monitoring database.
+        Args:
+            data (dict): Metadata already collected by load_file_info(),
+                         e.g. via collect_file_info(); gathered here if None
+        """
+        if data is None:
+            data = self.load_file_info()
         
-        # Add monitoring configuration
-        data["monitoring"] = {
-            "watch_events": watch_event,
-            "alert_mode": alert_mode,
-            "added_on": datetime.now().isoformat()
-        }
-        # Append as newline-delimited JSON
-        # Security: File permissions should be 0o600 (owner-only)
-        with open("/opt/vigilo/file_info.json", "a") as f:
-            f.write(json.dumps(data) + "\n")
+        with MonitoredFile.bulk() as tx:
+            tx.add(self.path, watch_event, alert_mode, data=data)
+    
+    @staticmethod
+    def bulk(db="/opt/vigilo/file_info.json"):
+        """
+        Batch several additions into one append to the database.
+        Usage:
+            with MonitoredFile.bulk(db) as tx:
+                tx.add(path, watch_events, alert_mode, data=...)
+        """
+        return _BulkAdd(db)
     
-    def get_current_info(self):
+    def get_current_info(self, prev=None):
         """
         Retrieve current state of the monitored file.
+        Args:
+            prev (dict): Previously recorded metadata (see load_file_info)
         """
         if not os.path.exists(self.path):
             return {
@@ -161,7 +280,7 @@ class MonitoredFile:
             }
         
         try:
-            return self.load_file_info()
+            return self.load_file_info(prev)
         except (FileNotFoundError, PermissionError, OSError):
             # File disappeared or became inaccessible
             return {
@@ -171,29 +290,340 @@ class MonitoredFile:
                 "deleted": True
             }
 
+class _BulkAdd:
+    """
+    Records queued by MonitoredFile.bulk(), appended with one write
+    when the with-block exits (also on error, for records already added).
+    """
+    
+    def __init__(self, db):
+        self.db = db
+        self.lines = []
+    
+    def add(self, path, watch_events, alert_mode, data=None):
+        """
+        Queue a file for the database.
+        Args:
+            data (dict): load_file_info() result; collected here if None
+        Raises:
+            OSError: If data must be collected and the file is unreadable
+        """
+        if data is None:
+            data = MonitoredFile(path).load_file_info()
+        
+        # Add monitoring configuration
+        data["monitoring"] = {
+            "watch_events": watch_events,
+            "alert_mode": alert_mode,
+            "added_on": datetime.now().isoformat()
+        }
+        self.lines.append(orjson.dumps(data) + b"\n")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if not self.lines:
+            return False
+        
+        # Append as newline-delimited JSON
+        # Security: owner-only permissions when the file is created
+        fd = os.open(self.db, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        with os.fdopen(fd, "ab") as f:
+            f.write(b"".join(self.lines))
+        self.lines = []
+        return False
+
+
+# =============================================================================
+# TIMESTAMP FORMATTING
+# =============================================================================
+
+@functools.lru_cache(maxsize=1024)
+def _iso_seconds(seconds):
+    """Local time of a whole-second timestamp as YYYY-MM-DDTHH:MM:SS."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(seconds))
+
+
+def _iso(timestamp):
+    """
+    Format a POSIX timestamp (float seconds) exactly like
+    datetime.fromtimestamp(timestamp).isoformat(): local time,
+    microseconds rounded half-to-even, fraction omitted when zero.
+    """
+    frac, seconds = math.modf(timestamp)
+    us = round(frac * 1e6)
+    if us < 0:
+        seconds, us = seconds - 1, us + 1_000_000
+    elif us >= 1_000_000:
+        seconds, us = seconds + 1, us - 1_000_000
+    
+    if us:
+        return f"{_iso_seconds(int(seconds))}.{us:06d}"
+    return _iso_seconds(int(seconds))
+
+
+# =============================================================================
+# OWNER / GROUP LOOKUPS
+# =============================================================================
+
+@functools.lru_cache(maxsize=1024)
+def _uid_name(uid):
+    """Resolve a UID to a user name, falling back to the numeric UID."""
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)  # UID does not exist
+
+
+@functools.lru_cache(maxsize=1024)
+def _gid_name(gid):
+    """Resolve a GID to a group name, falling back to the numeric GID."""
+    try:
+        return grp.getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)  # GID does not exist
+
+
+def clear_owner_cache():
+    """Forget cached user/group names (e.g. after /etc/passwd changes)."""
+    _uid_name.cache_clear()
+    _gid_name.cache_clear()
+
+
+# =============================================================================
+# HASHING UTILITIES
+# =============================================================================
+
+def _get_hash_pool():
+    """Return the shared pool used for tree hashing, creating it lazily."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ThreadPoolExecutor(
+                max_workers=PARALLEL_HASH_WORKERS,
+                thread_name_prefix="vigilo-hash"
+            )
+        return _hash_pool
+
+
+def checksum_scheme(checksum):
+    """
+    Scheme of a stored checksum: "blake3", "tsha256" or "sha256"
+    (plain hex, no prefix).
+    """
+    prefix, sep, _ = checksum.partition(":")
+    return prefix if sep else "sha256"
+
+
+def _hash_stream(f, hasher):
+    """
+    Feed an unbuffered binary file into hasher.
+    One buffer is reused for every read, so no bytes object is
+    allocated per chunk.
+    """
+    buf = bytearray(HASH_READ_SIZE)
+    view = memoryview(buf)
+    
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            break
+        hasher.update(view[:n])
+    return hasher
+
+
+def _sha256_range(fd, start, end):
+    """SHA-256 digest of bytes [start, end) of fd, using positional reads."""
+    sha = _SHA256_PROTO.copy()
+    buf = bytearray(HASH_READ_SIZE)
+    view = memoryview(buf)
+    pos = start
+    
+    while pos < end:
+        n = os.preadv(fd, [view[:min(HASH_READ_SIZE, end - pos)]], pos)
+        if not n:
+            break  # File was truncated while hashing
+        sha.update(view[:n])
+        pos += n
+    return sha.digest()
+
+
+def _parallel_sha256(path):
+    """
+    Tree hash of a large file.
+    
+    The file is split into PARALLEL_HASH_CHUNK sized ranges, each range
+    is hashed on the shared pool, and the result is the SHA-256 of the
+    concatenated range digests followed by the file size.
+    Stored with a "tsha256:" prefix so it never compares equal to a
+    plain SHA-256 checksum.
+    
+    Returns:
+        str: Hex digest
+    """
+    with open(path, "rb", buffering=0) as f:
+        fd = f.fileno()
+        size = os.fstat(fd).st_size
+        step = PARALLEL_HASH_CHUNK
+        
+        pool = _get_hash_pool()
+        futures = [
+            pool.submit(_sha256_range, fd, start, min(start + step, size))
+            for start in range(0, size, step)
+        ]
+        digests = [future.result() for future in futures]
+    
+    return hashlib.sha256(b"".join(digests) + size.to_bytes(8, "big")).hexdigest()
+
+
+def _monitored_files(paths, stats=None):
+    """
+    Build MonitoredFile objects for many paths.
+    
+    Paths whose stat the caller already holds use it directly, the rest
+    are stated together by stat_paths().
+    """
+    stats = dict(stats or {})
+    missing = [path for path in paths if stats.get(path) is None]
+    stats.update(stat_paths(missing))
+    
+    files = []
+    for path in paths:
+        st = stats.get(path)
+        if isinstance(st, OSError):
+            # load_file_info() raises the error again for the caller
+            st = None
+        files.append(MonitoredFile(path, stat=st))
+    return files
+
+
+def stat_paths(paths):
+    """
+    Stat many files, resolving each parent directory only once.
+    
+    Paths sharing a parent are stated with fstatat() relative to one open
+    descriptor of it, instead of walking every path component per file.
+    
+    Args:
+        paths (list): Absolute paths
+    
+    Returns:
+        dict: {path: os.stat_result, or the OSError raised}
+    """
+    by_parent = {}
+    for path in paths:
+        by_parent.setdefault(os.path.dirname(path), []).append(path)
+    
+    results = {}
+    for parent, group in by_parent.items():
+        dir_fd = None
+        if len(group) > 1 and os.stat in os.supports_dir_fd:
+            try:
+                dir_fd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+            except OSError:
+                dir_fd = None
+        
+        try:
+            for path in group:
+                try:
+                    if dir_fd is None:
+                        results[path] = os.stat(path)
+                    else:
+                        results[path] = os.stat(os.path.basename(path), dir_fd=dir_fd)
+                except OSError as e:
+                    results[path] = e
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+    return results
+
+
+def collect_file_info(paths, stats=None):
+    """
+    Stat and hash several files in parallel.
+    
+    hashlib releases the GIL while digesting, so reading and hashing
+    many files overlaps well across threads.
+    
+    Args:
+        paths (list): Absolute paths to collect
+        stats (dict): Optional {path: os.stat_result} already taken
+    
+    Returns:
+        dict: {path: load_file_info() result, or the OSError raised}
+    """
+    results = {}
+    if not paths:
+        return results
+    
+    workers = min(32, (os.cpu_count() or 1) * 4, len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(mf.load_file_info): mf.path
+            for mf in _monitored_files(paths, stats)
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                results[path] = future.result()
+            except OSError as e:
+                results[path] = e
+    return results
+
+
 # =============================================================================
 # VALIDATION UTILITIES
 # =============================================================================
 
+@functools.lru_cache(maxsize=1024)
+def absolute_path(path):
+    """
+    Equivalent of os.path.abspath() that calls os.getcwd() only once
+    per process instead of once per relative path. Results are cached,
+    the watcher normalizes the same few paths on every event.
+    """
+    global _cwd
+    if os.path.isabs(path):
+        return os.path.normpath(path)
+    
+    if _cwd is None:
+        _cwd = os.getcwd()
+    return os.path.normpath(os.path.join(_cwd, path))
+
+
+def dir_prefixes(dirs):
+    """
+    Build the str.startswith() tuple matching each directory and anything
+    below it, but not its siblings ("/opt" must not allow "/opt2").
+    Match it against path + "/" so the directory itself is included.
+    Idempotent: passing its own result returns the same prefixes.
+    """
+    return _dir_prefixes(tuple(dirs))
+
+
+@functools.lru_cache(maxsize=32)
+def _dir_prefixes(dirs):
+    return tuple(d.rstrip("/") + "/" for d in dirs)
+
+
 def validate_path(path, allowed_dirs=None):
-    abs_path = os.path.abspath(path)
+    """
+    Check that a path may be monitored.
+    Args:
+        path (str): Path to check
+        allowed_dirs (list|tuple): Directories to restrict to (plain or
+            already built by dir_prefixes())
+    """
+    abs_path = absolute_path(path)
     
     # Optional: Restrict to allowed directories
     if allowed_dirs:
-        if not any(abs_path.startswith(d) for d in allowed_dirs):
+        if not (abs_path + "/").startswith(dir_prefixes(allowed_dirs)):
             return False
     
-    # Block obviously dangerous paths (extend as needed)
-    forbidden_patterns = [
-        "/etc/shadow",
-        "/etc/passwd",
-        "/root/.ssh",
-        "/proc",
-        "/sys"
-    ]
-    
-    for pattern in forbidden_patterns:
-        if abs_path.startswith(pattern):
-            return False
+    # Block obviously dangerous paths (extend FORBIDDEN_PATHS as needed)
+    if abs_path.startswith(FORBIDDEN_PATHS):
+        return False
     
     return True
\ No newline at end of file
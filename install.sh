@@ -231,6 +231,19 @@ install_files() {
         fi
     done
     
+    # Embed the help text in a module so 'vigilo help' needs no file read
+    if [[ -f "$SCRIPT_DIR/command_help.txt" ]]; then
+        "$PYTHON_BIN" -c '
+import sys
+with open(sys.argv[1], encoding="utf-8") as f:
+    text = f.read()
+with open(sys.argv[2], "w", encoding="utf-8") as f:
+    f.write("# Generated by install.sh from command_help.txt, do not edit\n")
+    f.write("TEXT = %r\n" % text)
+' "$SCRIPT_DIR/command_help.txt" "$INSTALL_PREFIX/_help_text.py"
+        print_info "Generated: _help_text.py"
+    fi
+    
     # Make main.py executable
     chmod +x "$INSTALL_PREFIX/main.py"
     
@@ -2,67 +2,227 @@
 import os
 import json
 import threading
+import orjson
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
 # Local imports
-from file_monitoring import MonitoredFile
+from file_monitoring import MonitoredFile, absolute_path
 
 # Global lock for thread-safe database operations
 _db_lock = threading.Lock()
 
+# Parsed file_info.json per database path: {file: (cookie, {path: record})}
+_INDEX = {}
+
+# Alert history files already checked for the legacy list format
+_history_checked = set()
+
+# fdatasync skips the inode timestamp flush; not available everywhere
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
 
 # =============================================================================
-# ALERT HISTORY MANAGEMENT
+# NDJSON READ HELPERS
 # =============================================================================
 
-def save_log_history(report, file="/opt/vigilo/alert_history.json"):
-        
-    with _db_lock:
-        all_reports = []
+def _read_lines(file):
+    """
+    Read an NDJSON database in one call.
+    Returns:
+        list: Non-empty lines as stripped bytes
+    """
+    with open(file, "rb") as f:
+        data = f.read()
+    
+    return [line.strip() for line in data.splitlines() if line.strip()]
+
+
+def _iter_records(file, only_path=None):
+    """
+    Parse an NDJSON database.
+    Args:
+        only_path (str): If set, lines that cannot contain this path
+                         are passed through unparsed
+    Yields:
+        tuple: (raw_line, record), record is None for corrupted or
+               unparsed lines, which callers keep as-is
+    """
+    # The path's JSON string literal: orjson writes non-ASCII as raw
+    # UTF-8; databases written by older versions (stdlib json) may still
+    # hold \uXXXX escapes
+    needles = ()
+    if only_path is not None:
+        needles = {orjson.dumps(only_path), json.dumps(only_path).encode()}
+    
+    for line in _read_lines(file):
+        if needles and not any(needle in line for needle in needles):
+            yield line, None
+            continue
         
-        # Read existing history
-        if os.path.exists(file):
-            try:
-                with open(file, "r") as f:
-                    all_reports = json.load(f)
-                
-                # Validate it's a list
-                if not isinstance(all_reports, list):
-                    all_reports = []
+        try:
+            yield line, orjson.loads(line)
+        except orjson.JSONDecodeError:
+            yield line, None
+
+
+def _load_index(file):
+    """
+    Return the records of an NDJSON database keyed by monitored path.
+    
+    The parse is cached for the life of the process and reused while
+    the file's (mtime_ns, size, inode) cookie is unchanged.
+    Returns:
+        dict: {path: record}, empty if the database does not exist
+    Raises:
+        OSError: If the database exists but cannot be read
+    """
+    try:
+        st = os.stat(file)
+    except FileNotFoundError:
+        _INDEX.pop(file, None)
+        return {}
+    
+    cookie = (st.st_mtime_ns, st.st_size, st.st_ino)
+    cached = _INDEX.get(file)
+    if cached is not None and cached[0] == cookie:
+        return cached[1]
+    
+    index = {}
+    for _, data in _iter_records(file):
+        if data is None:
+            continue
+        path = data.get("file", {}).get("path")
+        if path:
+            index.setdefault(path, data)  # First entry wins, as in a scan
+    
+    _INDEX[file] = (cookie, index)
+    return index
+
+
+def _find_record(file, path):
+    """
+    Look up one monitored path.
+    Uses the cached index when it is still fresh; otherwise scans the
+    database parsing only lines that can contain the path, instead of
+    building the whole index for a single CLI lookup.
+    Returns:
+        dict: The record, or None if the path is not monitored
+    Raises:
+        OSError: If the database cannot be read
+    """
+    cached = _INDEX.get(file)
+    if cached is not None:
+        st = os.stat(file)
+        if cached[0] == (st.st_mtime_ns, st.st_size, st.st_ino):
+            return cached[1].get(path)
+    
+    for _, data in _iter_records(file, only_path=path):
+        if data is not None and data.get("file", {}).get("path") == path:
+            return data
+    return None
+
+
+def _invalidate_index(file):
+    """Drop the cached index after the database was rewritten."""
+    _INDEX.pop(file, None)
+
+
+def _ndjson(lines):
+    """Join NDJSON byte lines into file content."""
+    return b"".join(line + b"\n" for line in lines)
+
+
+def _atomic_write(file, data):
+    """
+    Durably replace file with data (bytes).
+    The content goes to a 0600 temp file in one write, is flushed to disk
+    with fdatasync, then renamed over file (POSIX guarantees atomicity).
+    Raises:
+        OSError: If any step fails (the temp file is removed)
+    """
+    temp_file = file + ".tmp"
+    
+    try:
+        fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            # Mode at open only applies to new files; a stale temp file
+            # keeps its old mode, so set it explicitly
+            os.fchmod(fd, 0o600)
             
-            except json.JSONDecodeError:
-                # Corrupted file, start fresh
-                all_reports = []
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
             
-            except (OSError, IOError):
-                # Cannot read file
-                all_reports = []
-        
-        # Append new report
-        all_reports.append(report)
-        
-        # Atomic write
-        temp_file = file + ".tmp"
+            _fdatasync(fd)
+        finally:
+            os.close(fd)
         
+        os.replace(temp_file, file)
+    
+    except (OSError, IOError):
         try:
-            with open(temp_file, "w") as f:
-                json.dump(all_reports, f, indent=4)
-            
-            # Set restrictive permissions (owner read/write only)
-            os.chmod(temp_file, 0o600)
+            os.unlink(temp_file)
+        except OSError:
+            pass  # Already gone (FileNotFoundError) or not removable
+        raise
+
+
+# =============================================================================
+# ALERT HISTORY MANAGEMENT
+# =============================================================================
+
+def _read_log_history(file):
+    """
+    Parse the alert history, accepting both the NDJSON format and the
+    legacy single JSON list written by older releases.
+    Returns:
+        tuple: (raw_lines, reports, legacy), raw_lines is None for legacy
+    """
+    with open(file, "rb") as f:
+        data = f.read()
+    
+    if data.lstrip().startswith(b"["):
+        try:
+            reports = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            reports = []
+        return None, reports if isinstance(reports, list) else [], True
+    
+    lines = [line.strip() for line in data.splitlines() if line.strip()]
+    reports = []
+    for line in lines:
+        try:
+            reports.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            reports.append(None)  # Corrupted line, kept by compaction
+    return lines, reports, False
+
+
+def _rewrite_log_history(file, lines):
+    """Atomically replace the alert history with NDJSON byte lines."""
+    _atomic_write(file, _ndjson(lines))
+
+
+def save_log_history(report, file="/opt/vigilo/alert_history.json"):
+    """
+    Append one alert to the history (newline-delimited JSON).
+    """
+    with _db_lock:
+        try:
+            # One-time migration of a legacy JSON list to NDJSON
+            if file not in _history_checked:
+                if os.path.exists(file):
+                    _, reports, legacy = _read_log_history(file)
+                    if legacy:
+                        _rewrite_log_history(file, [orjson.dumps(r) for r in reports])
+                _history_checked.add(file)
             
-            # Atomic rename
-            os.replace(temp_file, file)
+            fd = os.open(file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            with os.fdopen(fd, "ab") as f:
+                f.write(orjson.dumps(report) + b"\n")
         
         except (OSError, IOError) as e:
-            # Clean up temp file on error
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except OSError:
-                    pass
-            
             print(f"⚠️ Error saving alert history: {e}")
 
 def show_log_history(file="/opt/vigilo/alert_history.json"):
@@ -73,20 +233,11 @@ def show_log_history(file="/opt/vigilo/alert_history.json"):
         return []
     
     try:
-        with open(file, "r") as f:
-            data = json.load(f)
-        
-        # Validate structure
-        if isinstance(data, list):
-            return data
-        else:
-            return []
-    
-    except json.JSONDecodeError:
-        return []
-    
+        _, reports, _ = _read_log_history(file)
     except (OSError, IOError):
         return []
+    
+    return [report for report in reports if report is not None]
 
 
 def delete_old_log_history(file="/opt/vigilo/alert_history.json", retention_years=2):
@@ -98,54 +249,53 @@ def delete_old_log_history(file="/opt/vigilo/alert_history.json", retention_year
     
     with _db_lock:
         try:
-            with open(file, "r") as f:
-                all_alerts = json.load(f)
-        
-        except json.JSONDecodeError:
-            return
+            lines, all_alerts, _ = _read_log_history(file)
         
         except (OSError, IOError):
             return
         
+        if lines is None:
+            lines = [orjson.dumps(alert) for alert in all_alerts]
+        
         # Calculate expiration date
         now = datetime.now()
         expiration_date = now - relativedelta(years=retention_years)
         
-        kept_alerts = []
+        # Reports carry naive datetime.isoformat() strings, which sort
+        # chronologically as text, so most alerts are kept by a string
+        # compare; only candidates for deletion are parsed
+        cutoff = expiration_date.isoformat()
+        
+        kept_lines = []
         
-        for alert in all_alerts:
+        for line, alert in zip(lines, all_alerts):
             try:
+                alert_time = alert["Time"]
+                if (isinstance(alert_time, str) and len(alert_time) >= 19
+                        and alert_time[10] == "T" and alert_time >= cutoff):
+                    kept_lines.append(line)
+                    continue
+                
                 # Parse alert timestamp
-                alert_time = datetime.fromisoformat(alert["Time"])
+                alert_time = datetime.fromisoformat(alert_time)
                 
                 # Keep if within retention period
                 if alert_time >= expiration_date:
-                    kept_alerts.append(alert)
+                    kept_lines.append(line)
             
-            except (KeyError, ValueError):
+            except (KeyError, TypeError, ValueError):
                 # Preserve alerts with invalid timestamps (fail-safe)
-                kept_alerts.append(alert)
-        
-        # Atomic write
-        temp_file = file + ".tmp"
+                kept_lines.append(line)
         
+        # Compact: rewrite with only the kept lines
         try:
-            with open(temp_file, "w") as f:
-                json.dump(kept_alerts, f, indent=4)
-            
-            os.chmod(temp_file, 0o600)
-            os.replace(temp_file, file)
+            _rewrite_log_history(file, kept_lines)
+            _history_checked.add(file)
             
-            deleted_count = len(all_alerts) - len(kept_alerts)
+            deleted_count = len(all_alerts) - len(kept_lines)
             print(f"🗑️  Deleted {deleted_count} old alert(s)")
         
         except (OSError, IOError) as e:
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except OSError:
-                    pass
-            
             print(f"⚠️  Error cleaning history: {e}")
 
 
@@ -163,47 +313,33 @@ def show_file_monitored_info(path, file="/opt/vigilo/file_info.json"):
     Returns:
         dict: Complete file information, or None if not found
     """
-    abs_path = os.path.abspath(path)
-    
-    if not os.path.exists(file):
-        return None
+    abs_path = absolute_path(path)
     
     try:
-        with open(file, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                try:
-                    data = json.loads(line)
-                    
-                    if data.get("file", {}).get("path") == abs_path:
-                        metadata = data.get("metadata", {})
-                        monitoring = data.get("monitoring", {})
-                        
-                        return {
-                            "file_name": data.get("file", {}).get("name"),
-                            "path": data.get("file", {}).get("path"),
-                            "type": data.get("file", {}).get("type"),
-                            "size": metadata.get("size"),
-                            "permissions": metadata.get("permissions"),
-                            "owner": metadata.get("owner"),
-                            "group": metadata.get("group"),
-                            "last_modified": metadata.get("last_modified"),
-                            "checksum": metadata.get("checksum"),
-                            "watch_events": monitoring.get("watch_events", []),
-                            "alert_mode": monitoring.get("alert_mode"),
-                            "added_on": monitoring.get("added_on")
-                        }
-                
-                except json.JSONDecodeError:
-                    continue
-    
+        data = _find_record(file, abs_path)
     except (OSError, IOError):
         return None
     
-    return None
+    if data is None:
+        return None
+    
+    metadata = data.get("metadata", {})
+    monitoring = data.get("monitoring", {})
+    
+    return {
+        "file_name": data.get("file", {}).get("name"),
+        "path": data.get("file", {}).get("path"),
+        "type": data.get("file", {}).get("type"),
+        "size": metadata.get("size"),
+        "permissions": metadata.get("permissions"),
+        "owner": metadata.get("owner"),
+        "group": metadata.get("group"),
+        "last_modified": metadata.get("last_modified"),
+        "checksum": metadata.get("checksum"),
+        "watch_events": monitoring.get("watch_events", []),
+        "alert_mode": monitoring.get("alert_mode"),
+        "added_on": monitoring.get("added_on")
+    }
 
 
 def show_all_file_monitored(file="/opt/vigilo/file_info.json"):
@@ -214,28 +350,21 @@ def show_all_file_monitored(file="/opt/vigilo/file_info.json"):
         return all_monitored
     
     try:
-        with open(file, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                try:
-                    data = json.loads(line)
-                    monitoring = data.get("monitoring", {})
-                    file_info = data.get("file", {})
-                    
-                    all_monitored.append({
-                        "file_name": file_info.get("name"),
-                        "path": file_info.get("path"),
-                        "type": file_info.get("type"),
-                        "watch_events": monitoring.get("watch_events", []),
-                        "alert_mode": monitoring.get("alert_mode"),
-                        "added_on": monitoring.get("added_on")
-                    })
-                
-                except json.JSONDecodeError:
-                    continue
+        for _, data in _iter_records(file):
+            if data is None:
+                continue
+            
+            monitoring = data.get("monitoring", {})
+            file_info = data.get("file", {})
+            
+            all_monitored.append({
+                "file_name": file_info.get("name"),
+                "path": file_info.get("path"),
+                "type": file_info.get("type"),
+                "watch_events": monitoring.get("watch_events", []),
+                "alert_mode": monitoring.get("alert_mode"),
+                "added_on": monitoring.get("added_on")
+            })
     
     except (OSError, IOError):
         return []
@@ -248,57 +377,18 @@ def show_all_file_monitored(file="/opt/vigilo/file_info.json"):
 
 def is_file_already_monitored(path, file="/opt/vigilo/file_info.json"):
     
-    abs_path = os.path.abspath(path)
-    
-    if not os.path.exists(file):
-        return False
+    abs_path = absolute_path(path)
     
     try:
-        with open(file, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                try:
-                    data = json.loads(line)
-                    if data.get("file", {}).get("path") == abs_path:
-                        return True
-                
-                except json.JSONDecodeError:
-                    continue
-    
+        return _find_record(file, abs_path) is not None
     except (OSError, IOError):
         return False
-    
-    return False
 
 def get_all_monitored_paths(file="/opt/vigilo/file_info.json"):
-    monitored_paths = set()
-    
-    if not os.path.exists(file):
-        return monitored_paths
-    
     try:
-        with open(file, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                try:
-                    data = json.loads(line)
-                    path = data.get("file", {}).get("path")
-                    if path:
-                        monitored_paths.add(path)
-                
-                except json.JSONDecodeError:
-                    continue
-    
+        return set(_load_index(file))
     except (OSError, IOError):
         return set()
-    
-    return monitored_paths
 
 # =============================================================================
 # FILE REMOVAL OPERATIONS
@@ -309,52 +399,33 @@ def remove_monitored_file_info(path, file="/opt/vigilo/file_info.json"):
     if not os.path.exists(file):
         return False
     
-    path = os.path.abspath(path)
+    path = absolute_path(path)
     
     with _db_lock:
         new_lines = []
         removed = False
         
         try:
-            with open(file, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    try:
-                        data = json.loads(line)
-                        
-                        if data.get("file", {}).get("path") != path:
-                            new_lines.append(json.dumps(data))
-                        else:
-                            removed = True
-                    
-                    except json.JSONDecodeError:
-                        # Preserve corrupted lines (fail-safe)
-                        new_lines.append(line)
+            # Nothing to rewrite if the path is not in the database
+            if _find_record(file, path) is None:
+                return False
+            
+            for line, data in _iter_records(file, only_path=path):
+                # Other and corrupted lines are preserved as-is (fail-safe)
+                if data is None or data.get("file", {}).get("path") != path:
+                    new_lines.append(line)
+                else:
+                    removed = True
         
         except (OSError, IOError):
             return False
         
         # Atomic write
-        temp_file = file + ".tmp"
-        
         try:
-            with open(temp_file, "w") as f:
-                for line in new_lines:
-                    f.write(line + "\n")
-            
-            os.chmod(temp_file, 0o600)
-            os.replace(temp_file, file)
+            _atomic_write(file, _ndjson(new_lines))
+            _invalidate_index(file)
         
         except (OSError, IOError) as e:
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except OSError:
-                    pass
-            
             print(f"⚠️  Error removing file from database: {e}")
             return False
         
@@ -366,14 +437,14 @@ def remove_file_event(path, file="/opt/vigilo/file_event.json"):
     if not os.path.exists(file):
         return False
     
-    path = os.path.abspath(path)
+    path = absolute_path(path)
     
     with _db_lock:
         try:
-            with open(file, "r") as f:
-                data = json.load(f)
+            with open(file, "rb") as f:
+                data = orjson.loads(f.read())
         
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return False
         
         except (OSError, IOError):
@@ -386,22 +457,10 @@ def remove_file_event(path, file="/opt/vigilo/file_event.json"):
             removed = True
         
         # Atomic write
-        temp_file = file + ".tmp"
-        
         try:
-            with open(temp_file, "w") as f:
-                json.dump(data, f, indent=4)
-            
-            os.chmod(temp_file, 0o600)
-            os.replace(temp_file, file)
+            _atomic_write(file, orjson.dumps(data))
         
         except (OSError, IOError) as e:
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except OSError:
-                    pass
-            
             print(f"⚠️  Error updating event index: {e}")
             return False
         
@@ -413,71 +472,91 @@ def remove_file_event(path, file="/opt/vigilo/file_event.json"):
 # =============================================================================
 
 def set_conf(path, change_type, new_events=None, new_alert_mode=None,file_info="/opt/vigilo/file_info.json", file_event="/opt/vigilo/file_event.json"):
-    path = os.path.abspath(path)
+    path = absolute_path(path)
     
     if not os.path.exists(file_info):
         return False
     
     with _db_lock:
         updated_lines = []
+        record = None
         updated = False
+        changed = False
         
         # ======================================================================
         # UPDATE file_info.json
         # ======================================================================
         
         try:
-            with open(file_info, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    try:
-                        data = json.loads(line)
-                        
-                        if data.get("file", {}).get("path") == path:
-                            monitoring = data.get("monitoring", {})
-                            
-                            # -------- SET_EVENTS --------
-                            if change_type == "SET_EVENTS" and isinstance(new_events, list):
-                                monitoring["watch_events"] = new_events
-                                updated = True
-                            
-                            # -------- ADD_EVENT --------
-                            elif change_type == "ADD_EVENT" and new_events:
-                                events = set(monitoring.get("watch_events", []))
-                                events.add(new_events)
-                                monitoring["watch_events"] = list(events)
-                                updated = True
-                            
-                            # -------- REMOVE_EVENT --------
-                            elif change_type == "REMOVE_EVENT" and new_events:
-                                events = set(monitoring.get("watch_events", []))
-                                events.discard(new_events)
-                                monitoring["watch_events"] = list(events)
-                                updated = True
-                            
-                            # -------- SET_ALERT --------
-                            elif change_type == "SET_ALERT" and new_alert_mode:
-                                monitoring["alert_mode"] = new_alert_mode
-                                updated = True
-                            
-                            # -------- SET_ALL --------
-                            elif change_type == "SET_ALL":
-                                if isinstance(new_events, list):
-                                    monitoring["watch_events"] = new_events
-                                if new_alert_mode:
-                                    monitoring["alert_mode"] = new_alert_mode
-                                updated = True
-                            
-                            data["monitoring"] = monitoring
-                        
-                        updated_lines.append(json.dumps(data))
-                    
-                    except json.JSONDecodeError:
-                        # Preserve corrupted lines
-                        updated_lines.append(line)
+            for line, data in _iter_records(file_info, only_path=path):
+                # Unchanged and corrupted lines are kept byte-for-byte
+                if data is None or data.get("file", {}).get("path") != path:
+                    updated_lines.append(line)
+                    continue
+                
+                monitoring = data.get("monitoring", {})
+                before = dict(monitoring)
+                
+                # -------- SET_EVENTS --------
+                if change_type == "SET_EVENTS" and isinstance(new_events, list):
+                    monitoring["watch_events"] = new_events
+                    updated = True
+                
+                # -------- ADD_EVENT --------
+                elif change_type == "ADD_EVENT" and new_events:
+                    events = set(monitoring.get("watch_events", []))
+                    events.add(new_events)
+                    monitoring["watch_events"] = list(events)
+                    updated = True
+                
+                # -------- REMOVE_EVENT --------
+                elif change_type == "REMOVE_EVENT" and new_events:
+                    events = set(monitoring.get("watch_events", []))
+                    events.discard(new_events)
+                    monitoring["watch_events"] = list(events)
+                    updated = True
+                
+                # -------- ADD_EVENTS_BULK --------
+                # Appends the missing events, keeping the existing order
+                elif change_type == "ADD_EVENTS_BULK" and isinstance(new_events, list):
+                    events = list(monitoring.get("watch_events", []))
+                    for event in new_events:
+                        if event not in events:
+                            events.append(event)
+                    monitoring["watch_events"] = events
+                    updated = True
+                
+                # -------- REMOVE_EVENTS_BULK --------
+                elif change_type == "REMOVE_EVENTS_BULK" and isinstance(new_events, list):
+                    drop = set(new_events)
+                    monitoring["watch_events"] = [
+                        event for event in monitoring.get("watch_events", [])
+                        if event not in drop
+                    ]
+                    updated = True
+                
+                # -------- SET_ALERT --------
+                elif change_type == "SET_ALERT" and new_alert_mode:
+                    monitoring["alert_mode"] = new_alert_mode
+                    updated = True
+                
+                # -------- SET_ALL --------
+                elif change_type == "SET_ALL":
+                    if isinstance(new_events, list):
+                        monitoring["watch_events"] = new_events
+                    if new_alert_mode:
+                        monitoring["alert_mode"] = new_alert_mode
+                    updated = True
+                
+                data["monitoring"] = monitoring
+                record = data
+                
+                if monitoring == before:
+                    updated_lines.append(line)
+                    continue
+                
+                updated_lines.append(orjson.dumps(data))
+                changed = True
         
         except (OSError, IOError):
             return False
@@ -485,33 +564,25 @@ def set_conf(path, change_type, new_events=None, new_alert_mode=None,file_info="
         if not updated:
             return False  # File not found in database
         
-        # Atomic write to file_info.json
-        temp_file = file_info + ".tmp"
+        if not changed:
+            return True  # Already configured that way, nothing to rewrite
         
+        # Atomic write to file_info.json
         try:
-            with open(temp_file, "w") as f:
-                for line in updated_lines:
-                    f.write(line + "\n")
-            
-            os.chmod(temp_file, 0o600)
-            os.replace(temp_file, file_info)
+            _atomic_write(file_info, _ndjson(updated_lines))
+            _invalidate_index(file_info)
         
         except (OSError, IOError) as e:
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except OSError:
-                    pass
-            
             print(f"⚠️  Error updating configuration: {e}")
             return False
         
         # ======================================================================
-        # REGENERATE file_event.json
+        # UPDATE file_event.json
         # ======================================================================
         
         try:
-            regenerate_event_index(file_info, file_event)
+            _patch_event_index(file_info, file_event, record=record,
+                               expected=len(updated_lines))
         except Exception as e:
             print(f"⚠️  Error regenerating event index: {e}")
             return False
@@ -519,52 +590,88 @@ def set_conf(path, change_type, new_events=None, new_alert_mode=None,file_info="
         return True
 
 
+def _add_event_entry(event_map, data):
+    """Add a record's monitoring configuration to an event index dict."""
+    if data is None:
+        return
+    
+    path = data.get("file", {}).get("path")
+    monitoring = data.get("monitoring", {})
+    
+    if path:
+        event_map[path] = {
+            "watch_events": monitoring.get("watch_events", []),
+            "alert_mode": monitoring.get("alert_mode")
+        }
+
+
+def _write_event_index(file_event, event_map):
+    """Atomically write the event index (file_event.json)."""
+    _atomic_write(file_event, orjson.dumps(event_map))
+
+
+def _patch_event_index(file_info, file_event, drop=None, record=None, records=(), expected=None):
+    """
+    Apply a small change to the event index.
+    Only the small file_event.json is parsed, not every file_info.json
+    record; falls back to a full rebuild if the index is unreadable or
+    holds fewer entries than expected.
+    Args:
+        drop (str): Path to remove from the index
+        record (dict): file_info record whose entry to add or replace
+        records (list): More records to add or replace
+        expected (int): Number of records in file_info.json, if known
+    """
+    try:
+        with open(file_event, "rb") as f:
+            event_map = orjson.loads(f.read())
+        if not isinstance(event_map, dict):
+            raise ValueError("event index is not an object")
+    
+    except (OSError, ValueError):
+        regenerate_event_index(file_info, file_event)
+        return
+    
+    if drop is not None:
+        event_map.pop(drop, None)
+    _add_event_entry(event_map, record)
+    for data in records:
+        _add_event_entry(event_map, data)
+    
+    # Entries missing (e.g. files added before 'add' kept the index up to
+    # date): rebuild once from file_info.json
+    if expected is not None and len(event_map) < expected:
+        regenerate_event_index(file_info, file_event)
+        return
+    
+    _write_event_index(file_event, event_map)
+
+
+def add_event_entries(records, file_info="/opt/vigilo/file_info.json", file_event="/opt/vigilo/file_event.json"):
+    """
+    Add newly monitored files to the event index.
+    Args:
+        records (list): file_info records just appended to the database
+    """
+    if not records:
+        return
+    
+    with _db_lock:
+        _patch_event_index(file_info, file_event, records=records)
+
+
 def regenerate_event_index(file_info="/opt/vigilo/file_info.json", file_event="/opt/vigilo/file_event.json"):
     monitored = {}
     
     if os.path.exists(file_info):
         try:
-            with open(file_info, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    try:
-                        data = json.loads(line)
-                        path = data.get("file", {}).get("path")
-                        monitoring = data.get("monitoring", {})
-                        
-                        if path:
-                            monitored[path] = {
-                                "watch_events": monitoring.get("watch_events", []),
-                                "alert_mode": monitoring.get("alert_mode")
-                            }
-                    
-                    except json.JSONDecodeError:
-                        continue
+            for _, data in _iter_records(file_info):
+                _add_event_entry(monitored, data)
         
         except (OSError, IOError):
             pass
     
-    # Atomic write
-    temp_file = file_event + ".tmp"
-    
-    try:
-        with open(temp_file, "w") as f:
-            json.dump(monitored, f, indent=4)
-        
-        os.chmod(temp_file, 0o600)
-        os.replace(temp_file, file_event)
-    
-    except (OSError, IOError) as e:
-        if os.path.exists(temp_file):
-            try:
-                os.remove(temp_file)
-            except OSError:
-                pass
-        
-        raise e
+    _write_event_index(file_event, monitored)
 
 
 # =============================================================================
@@ -576,91 +683,97 @@ def update_files_state(file_info_path, file_event_path, event_type, src_path, de
     if not os.path.exists(file_info_path):
         return
     
-    src_path = os.path.abspath(src_path)
-    dest_path = os.path.abspath(dest_path) if dest_path else None
+    src_path = absolute_path(src_path)
+    dest_path = absolute_path(dest_path) if dest_path else None
     
     with _db_lock:
         updated_lines = []
+        record = None
+        changed = False
         
         try:
-            with open(file_info_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    try:
-                        data = json.loads(line)
-                        path = data.get("file", {}).get("path")
-                        
-                        # -------- DELETE --------
-                        if event_type == "delete" and path == src_path:
-                            # Skip this entry (remove from database)
-                            continue
-                        
-                        # -------- MOVE --------
-                        if event_type == "move" and path == src_path and dest_path:
-                            if os.path.exists(dest_path):
-                                mf = MonitoredFile(dest_path)
-                                try:
-                                    new_data = mf.load_file_info()
-                                    new_data["monitoring"] = data.get("monitoring", {})
-                                    updated_lines.append(json.dumps(new_data))
-                                except (FileNotFoundError, PermissionError, OSError):
-                                    # Destination no longer accessible
-                                    pass
-                            continue
-                        
-                        # -------- MODIFY / ADD --------
-                        if event_type in ["modify", "add"] and path == src_path:
-                            if os.path.exists(src_path):
-                                mf = MonitoredFile(src_path)
-                                try:
-                                    new_data = mf.load_file_info()
-                                    new_data["monitoring"] = data.get("monitoring", {})
-                                    updated_lines.append(json.dumps(new_data))
-                                except (FileNotFoundError, PermissionError, OSError):
-                                    # File no longer accessible
-                                    updated_lines.append(json.dumps(data))
-                            else:
-                                # File was deleted, keep old state
-                                updated_lines.append(json.dumps(data))
-                            continue
+            for line, data in _iter_records(file_info_path, only_path=src_path):
+                if data is None:
+                    # Preserve corrupted and unrelated lines
+                    updated_lines.append(line)
+                    continue
+                
+                path = data.get("file", {}).get("path")
+                
+                # -------- UNCHANGED --------
+                if path != src_path:
+                    updated_lines.append(line)
+                    continue
+                
+                # -------- DELETE --------
+                if event_type == "delete":
+                    # Skip this entry (remove from database)
+                    changed = True
+                    continue
+                
+                # -------- MOVE --------
+                if event_type == "move" and dest_path:
+                    changed = True
+                    if os.path.exists(dest_path):
+                        mf = MonitoredFile(dest_path)
+                        try:
+                            new_data = mf.load_file_info()
+                            new_data["monitoring"] = data.get("monitoring", {})
+                            updated_lines.append(orjson.dumps(new_data))
+                            record = new_data
+                        except (FileNotFoundError, PermissionError, OSError):
+                            # Destination no longer accessible
+                            pass
+                    continue
+                
+                # -------- MODIFY / ADD --------
+                if event_type in ["modify", "add"]:
+                    if os.path.exists(src_path):
+                        mf = MonitoredFile(src_path)
+                        try:
+                            # Reuse the stored checksum if the stat is unchanged
+                            new_data = mf.load_file_info(prev=data.get("metadata"))
+                            new_data["monitoring"] = data.get("monitoring", {})
+                        except (FileNotFoundError, PermissionError, OSError):
+                            # File no longer accessible
+                            new_data = data
                         
-                        # -------- UNCHANGED --------
-                        updated_lines.append(json.dumps(data))
-                    
-                    except json.JSONDecodeError:
-                        # Preserve corrupted lines
+                        if new_data == data:
+                            updated_lines.append(line)
+                        else:
+                            updated_lines.append(orjson.dumps(new_data))
+                            changed = True
+                    else:
+                        # File was deleted, keep old state
                         updated_lines.append(line)
+                    continue
+                
+                updated_lines.append(line)
         
         except (OSError, IOError):
             return
         
-        # Atomic write to file_info.json
-        temp_file = file_info_path + ".tmp"
+        # Nothing to persist (untracked path or metadata already current)
+        if not changed:
+            return
         
+        # Atomic write to file_info.json
         try:
-            with open(temp_file, "w") as f:
-                for line in updated_lines:
-                    f.write(line + "\n")
-            
-            os.chmod(temp_file, 0o600)
-            os.replace(temp_file, file_info_path)
+            _atomic_write(file_info_path, _ndjson(updated_lines))
+            _invalidate_index(file_info_path)
         
         except (OSError, IOError) as e:
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except OSError:
-                    pass
-            
             print(f"⚠️  Error updating database state: {e}")
             return
         
-        # Regenerate event index
+        # A modify only touches metadata, so the event index can change
+        # only on delete/move
+        if event_type not in ("delete", "move"):
+            return
+        
         try:
-            regenerate_event_index(file_info_path, file_event_path)
+            _patch_event_index(file_info_path, file_event_path, drop=src_path, record=record,
+                               expected=len(updated_lines))
         except Exception as e:
             print(f"⚠️  Error regenerating event index: {e}")
 
@@ -693,13 +806,13 @@ def show_command_help(file="/opt/vigilo/command_help.txt"):
 # =============================================================================
 
 def initialize_database(file_info="/opt/vigilo/file_info.json", file_event="/opt/vigilo/file_event.json"):
-   
-    if not os.path.exists(file_info):
-        with open(file_info, "w") as f:
-            pass  # Create empty file
-        os.chmod(file_info, 0o600)
-    
-    if not os.path.exists(file_event):
-        with open(file_event, "w") as f:
-            json.dump({}, f)
-        os.chmod(file_event, 0o600)
\ No newline at end of file
+    
+    # O_EXCL creates each file only if missing, without a separate stat
+    for path, content in ((file_info, b""), (file_event, orjson.dumps({}))):
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            continue
+        
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
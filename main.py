@@ -1,15 +1,14 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import sys
 import os
-import json
-import threading
-import time
-import signal
+import orjson
+from datetime import datetime
 
 # Local imports
-from file_monitoring import MonitoredFile, validate_path
-from FileWatcher import FileWatcher
+from file_monitoring import MonitoredFile, validate_path, collect_file_info, absolute_path, dir_prefixes, stat_paths
+from alert_manager import VALID_ALERT_MODES
 from logger import (
     is_file_already_monitored,
     get_all_monitored_paths,
@@ -19,9 +18,9 @@ from logger import (
     remove_file_event,
     set_conf,
     show_command_help,
-    initialize_database
+    initialize_database,
+    add_event_entries
 )
-from alert_manager import AlertManager, test_alert_system
 
 # Database file paths
 FILE_INFO_DB = "/opt/vigilo/file_info.json"
@@ -29,9 +28,22 @@ FILE_EVENT_DB = "/opt/vigilo/file_event.json"
 
 # Allowed directories for monitoring
 ALLOWED_DIRS = ["/home","/var/log","/opt","/srv","/tmp"]
+_ALLOWED_PREFIXES = dir_prefixes(ALLOWED_DIRS)
 
-# Global watcher instance (for signal handling)
-_watcher_instance = None
+# Reported by --version
+VERSION = "Vigilo 1.0.0"
+
+# Accepted --events values
+_VALID_EVENTS = frozenset(("modify", "delete", "move", "permissions", "add"))
+
+# Separator line of the list/info/start output
+_BANNER = "=" * 80
+
+# Display format of timestamps in 'vigilo list'
+_LIST_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Set once ensure_db_exists() has run in this process
+_DB_READY = False
 
 
 # =============================================================================
@@ -40,9 +52,14 @@ _watcher_instance = None
 
 def ensure_db_exists():
     """
-    Create database files if they don't exist
+    Create database files if they don't exist (once per process)
     """
+    global _DB_READY
+    if _DB_READY:
+        return
+    
     initialize_database(FILE_INFO_DB, FILE_EVENT_DB)
+    _DB_READY = True
 
 
 # =============================================================================
@@ -86,7 +103,7 @@ def command_add(args):
     # Validate alert mode
     # =========================================================================
     
-    if not AlertManager.validate_alert_mode(args.alert):
+    if args.alert not in VALID_ALERT_MODES:
         print(f" Invalid alert mode: {args.alert}")
         print(f"   Valid modes: {', '.join(['system', 'log', 'email', 'remote', 'silent'])}")
         sys.exit(1)
@@ -101,19 +118,23 @@ def command_add(args):
     # Process each file
     # =========================================================================
     
-    added_count = 0
+    to_add = []
+    stats = {}
     
-    for path in args.files:
-        # Normalize to absolute path
-        abs_path = os.path.abspath(path)
-        
+    # Normalize to absolute paths and stat them, one directory lookup per
+    # parent; the stats are kept for collect_file_info
+    abs_paths = [absolute_path(path) for path in args.files]
+    found = stat_paths(abs_paths)
+    
+    for abs_path in abs_paths:
         # Check if file exists
-        if not os.path.exists(abs_path):
+        st = found[abs_path]
+        if isinstance(st, OSError):
             print(f"⚠️ File not found: {abs_path}")
             continue
         
         # Security: Validate path against whitelist
-        if not validate_path(abs_path, ALLOWED_DIRS):
+        if not validate_path(abs_path, _ALLOWED_PREFIXES):
             print(f"⚠️ Path not allowed: {abs_path}")
             print(f" Allowed directories: {', '.join(ALLOWED_DIRS)}")
             continue
@@ -123,24 +144,45 @@ def command_add(args):
             print(f"⚠️ Already monitoring: {abs_path}")
             continue
         
-        # Add to database
-        try:
-            mf = MonitoredFile(abs_path)
-            mf.save_initial_info(
-                watch_event=watch_events,
-                alert_mode=args.alert
-            )
-            
-            print(f"✅ Added to monitoring: {abs_path}")
-            print(f"   Events: {', '.join(watch_events)}")
-            print(f"   Alert mode: {args.alert}")
-            
-            added_count += 1
-            existing_paths.add(abs_path)  # Update for next iteration
-        
-        except (PermissionError, OSError) as e:
-            print(f"❌ Cannot access file: {abs_path}")
-            print(f"   Error: {e}")
+        to_add.append(abs_path)
+        stats[abs_path] = st
+        existing_paths.add(abs_path)  # Update for next iteration
+    
+    # Hash all accepted files in parallel, then save in one append
+    infos = collect_file_info(to_add, stats)
+    added = []
+    
+    try:
+        with MonitoredFile.bulk(FILE_INFO_DB) as tx:
+            for abs_path in to_add:
+                data = infos[abs_path]
+                if isinstance(data, OSError):
+                    print(f"❌ Cannot access file: {abs_path}")
+                    print(f"   Error: {data}")
+                    continue
+                
+                tx.add(abs_path, watch_events, args.alert, data=data)
+                added.append(abs_path)
+    
+    except (PermissionError, OSError) as e:
+        print(f"❌ Cannot write database: {FILE_INFO_DB}")
+        print(f"   Error: {e}")
+        sys.exit(1)
+    
+    # Register the new files in the event index (tx.add() stored their
+    # monitoring section in the collected records)
+    try:
+        add_event_entries([infos[abs_path] for abs_path in added], FILE_INFO_DB, FILE_EVENT_DB)
+    except (PermissionError, OSError) as e:
+        print(f"⚠️  Cannot update event index: {FILE_EVENT_DB}")
+        print(f"   Error: {e}")
+    
+    # Same detail lines for every file: format them once
+    details = f"   Events: {', '.join(watch_events)}\n   Alert mode: {args.alert}"
+    for abs_path in added:
+        print(f"✅ Added to monitoring: {abs_path}\n{details}")
+    
+    added_count = len(added)
     
     # Summary
     if added_count > 0:
@@ -158,7 +200,7 @@ def command_remove(args):
     """
     ensure_db_exists()
     
-    abs_path = os.path.abspath(args.file)
+    abs_path = absolute_path(args.file)
     
     # Check if file is being monitored
     if not is_file_already_monitored(abs_path, FILE_INFO_DB):
@@ -190,8 +232,8 @@ def command_list(args):
         print(" Use 'vigilo add <file>' to start monitoring")
         return
     
-    print(f"\nMonitoring {len(monitored_files)} file(s):")
-    print("=" * 80)
+    # Whole listing is built first and written at once
+    lines = [f"\nMonitoring {len(monitored_files)} file(s):\n", _BANNER + "\n"]
     
     for file_info in monitored_files:
         path = file_info.get("path", "Unknown")
@@ -202,19 +244,20 @@ def command_list(args):
         
         # Format added_on timestamp
         try:
-            from datetime import datetime
-            dt = datetime.fromisoformat(added_on)
-            added_on = dt.strftime("%Y-%m-%d %H:%M:%S")
+            added_on = datetime.fromisoformat(added_on).strftime(_LIST_TIME_FORMAT)
         except (ValueError, TypeError):
             pass
         
-        print(f"\n{path}")
-        print(f"   Type:       {file_type}")
-        print(f"   Events:     {', '.join(events)}")
-        print(f"   Alert mode: {alert_mode}")
-        print(f"   Added:      {added_on}")
+        lines.append(
+            f"\n{path}\n"
+            f"   Type:       {file_type}\n"
+            f"   Events:     {', '.join(events)}\n"
+            f"   Alert mode: {alert_mode}\n"
+            f"   Added:      {added_on}\n"
+        )
     
-    print("\n" + "=" * 80)
+    lines.append("\n" + _BANNER + "\n")
+    sys.stdout.writelines(lines)
 
 # =============================================================================
 # COMMAND: INFO
@@ -226,7 +269,7 @@ def command_info(args):
     """
     ensure_db_exists()
     
-    abs_path = os.path.abspath(args.file)
+    abs_path = absolute_path(args.file)
     
     file_info = show_file_monitored_info(abs_path, FILE_INFO_DB)
     
@@ -235,11 +278,13 @@ def command_info(args):
         sys.exit(1)
     
     # Pretty-print as JSON
-    print("\n" + "=" * 80)
-    print(f"FILE MONITORING INFORMATION")
-    print("=" * 80)
-    print(json.dumps(file_info, indent=2))
-    print("=" * 80)
+    sys.stdout.writelines((
+        "\n" + _BANNER + "\n",
+        "FILE MONITORING INFORMATION\n",
+        _BANNER + "\n",
+        orjson.dumps(file_info, option=orjson.OPT_INDENT_2).decode() + "\n",
+        _BANNER + "\n"
+    ))
 
 
 # =============================================================================
@@ -254,7 +299,7 @@ def command_alert(args):
     
     if args.alert_subcommand == "set":
         # Set alert mode for a file
-        abs_path = os.path.abspath(args.file)
+        abs_path = absolute_path(args.file)
         
         # Check if file is monitored
         if not is_file_already_monitored(abs_path, FILE_INFO_DB):
@@ -262,7 +307,7 @@ def command_alert(args):
             sys.exit(1)
         
         # Validate alert mode
-        if not AlertManager.validate_alert_mode(args.method):
+        if args.method not in VALID_ALERT_MODES:
             print(f"❌ Invalid alert mode: {args.method}")
             print(f"   Valid modes: {', '.join(['system', 'log', 'email', 'remote', 'silent'])}")
             sys.exit(1)
@@ -285,6 +330,7 @@ def command_alert(args):
     
     elif args.alert_subcommand == "test":
         # Test alert system
+        from alert_manager import test_alert_system
         test_alert_system()
     
     else:
@@ -311,26 +357,38 @@ def command_start(args):
         print("   Use 'vigilo add <file>' to add files before starting")
         sys.exit(1)
     
+    # watchdog and the alert stack are only needed by the service
+    import signal
+    from FileWatcher import FileWatcher
+    
     print(" Starting VIGILO File Integrity Monitoring Service")
-    print("=" * 80)
+    print(_BANNER)
     
-    # Create watcher instance
-    global _watcher_instance
-    fw = FileWatcher(FILE_INFO_DB, FILE_EVENT_DB)
-    _watcher_instance = fw
+    # Create the process-wide watcher instance
+    fw = FileWatcher.instance(
+        FILE_INFO_DB,
+        FILE_EVENT_DB,
+        alert_batch_window=args.alert_batch_window,
+        alert_batch_max=args.alert_batch_max
+    )
     
     # Install signal handlers for graceful shutdown
     def signal_handler(signum, frame):
         """Handle shutdown signals gracefully."""
         print(f"\n Received signal {signum}, shutting down...")
-        if _watcher_instance and _watcher_instance.observer:
-            _watcher_instance.observer.stop()
-        sys.exit(0)
+        FileWatcher.instance().stop()
     
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
-    # Start monitoring (this blocks until interrupted)
+    # SIGHUP reloads configuration and clears the owner/alert-mode caches
+    def reload_handler(signum, frame):
+        """Schedule a configuration reload."""
+        FileWatcher.instance().request_reload()
+    
+    signal.signal(signal.SIGHUP, reload_handler)
+    
+    # Start monitoring (blocks until a signal handler calls stop())
     try:
         fw.start()
     except Exception as e:
@@ -349,8 +407,13 @@ def command_help(args):
     Args:
         args: Parsed arguments (no specific args for help)
     """
-    help_text = show_command_help("command_help.txt")
-    print(help_text)
+    # Installed copies embed the text (generated by install.sh)
+    try:
+        from _help_text import TEXT
+    except ImportError:
+        TEXT = show_command_help("command_help.txt")
+    
+    print(TEXT)
 
 
 # =============================================================================
@@ -363,34 +426,30 @@ def command_events(args):
     """
     ensure_db_exists()
     
-    abs_path = os.path.abspath(args.file)
+    abs_path = absolute_path(args.file)
     
     # Check if file is monitored
     if not is_file_already_monitored(abs_path, FILE_INFO_DB):
         print(f"File is not being monitored: {abs_path}")
         sys.exit(1)
     
-    # Valid event types
-    valid_events = {"modify", "delete", "move", "permissions", "add"}
-    
     # Validate events
     for event in args.events:
-        if event not in valid_events:
+        if event not in _VALID_EVENTS:
             print(f"Invalid event type: {event}")
-            print(f"   Valid events: {', '.join(valid_events)}")
+            print(f"   Valid events: {', '.join(sorted(_VALID_EVENTS))}")
             sys.exit(1)
     
     # Perform operation based on subcommand
     if args.events_subcommand == "add":
-        # Add events one by one
-        for event in args.events:
-            success = set_conf(
-                path=abs_path,
-                change_type="ADD_EVENT",
-                new_events=event,
-                file_info=FILE_INFO_DB,
-                file_event=FILE_EVENT_DB
-            )
+        # Add all events in one database update
+        success = set_conf(
+            path=abs_path,
+            change_type="ADD_EVENTS_BULK",
+            new_events=list(args.events),
+            file_info=FILE_INFO_DB,
+            file_event=FILE_EVENT_DB
+        )
         
         if success:
             print(f"Events added: {', '.join(args.events)}")
@@ -399,15 +458,14 @@ def command_events(args):
             sys.exit(1)
     
     elif args.events_subcommand == "remove":
-        # Remove events one by one
-        for event in args.events:
-            success = set_conf(
-                path=abs_path,
-                change_type="REMOVE_EVENT",
-                new_events=event,
-                file_info=FILE_INFO_DB,
-                file_event=FILE_EVENT_DB
-            )
+        # Remove all events in one database update
+        success = set_conf(
+            path=abs_path,
+            change_type="REMOVE_EVENTS_BULK",
+            new_events=list(args.events),
+            file_info=FILE_INFO_DB,
+            file_event=FILE_EVENT_DB
+        )
         
         if success:
             print(f"Events removed: {', '.join(args.events)}")
@@ -440,10 +498,38 @@ def command_events(args):
 # MAIN ENTRY POINT
 # =============================================================================
 
-def main():
+# Options of 'vigilo start', shared by its subparser and the bare
+# 'vigilo start' shortcut in main()
+_START_OPTIONS = (
+    ("--alert-batch-window", {
+        "type": float,
+        "metavar": "SECONDS",
+        "help": "Group email/remote alerts raised within this window into one message, 0 to disable (default: 5)"
+    }),
+    ("--alert-batch-max", {
+        "type": int,
+        "metavar": "N",
+        "help": "Maximum alerts per grouped message (default: 50)"
+    })
+)
+
+
+def _option_defaults(options):
     """
-    Main entry point for FIM CLI.
-    Parses command-line arguments and dispatches to appropriate command handler.
+    Namespace values argparse would give options that were not passed.
+    Returns:
+        dict: {dest: default}
+    """
+    return {
+        opts.get("dest", flag.lstrip("-").replace("-", "_")): opts.get("default")
+        for flag, opts in options
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """
+    Build the argument parser (once per process).
     """
     parser = argparse.ArgumentParser(
         prog="vigilo",
@@ -455,7 +541,7 @@ def main():
     parser.add_argument(
         "--version",
         action="version",
-        version="Vigilo 1.0.0"
+        version=VERSION
     )
     
     # Subcommand parsers
@@ -573,6 +659,9 @@ def main():
         help="Start the monitoring service"
     )
     
+    for flag, options in _START_OPTIONS:
+        start_parser.add_argument(flag, **options)
+    
     start_parser.set_defaults(func=command_start)
     
     # =========================================================================
@@ -690,16 +779,43 @@ def main():
     
     help_parser.set_defaults(func=command_help)
     
-    # =========================================================================
-    # Parse and execute
-    # =========================================================================
+    return parser
+
+
+# Commands that take no argument, run without argparse when given alone:
+# command -> (handler, parser defaults of its options)
+_COMMAND_DISPATCH = {
+    "list": (command_list, {}),
+    "help": (command_help, {}),
+    "start": (command_start, _option_defaults(_START_OPTIONS))
+}
+
+
+def main():
+    """
+    Main entry point for FIM CLI.
+    Parses command-line arguments and dispatches to appropriate command handler.
+    """
+    argv = sys.argv[1:]
+    
+    # Fast paths that need no parser
+    if argv == ["--version"]:
+        print(VERSION)
+        return
     
-    args = parser.parse_args()
+    shortcut = _COMMAND_DISPATCH.get(argv[0]) if len(argv) == 1 else None
     
-    # Show help if no command specified
-    if not args.command:
-        parser.print_help()
-        sys.exit(1)
+    if shortcut:
+        func, defaults = shortcut
+        args = argparse.Namespace(command=argv[0], func=func, **defaults)
+    else:
+        parser = _build_parser()
+        args = parser.parse_args(argv)
+        
+        # Show help if no command specified
+        if not args.command:
+            parser.print_help()
+            sys.exit(1)
     
     # Execute command
     try:
@@ -708,9 +824,13 @@ def main():
         print("\n\n⚠️  Operation cancelled by user")
         sys.exit(130)
     except Exception as e:
-        print(f"\n Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"\n Unexpected error: {e}", file=sys.stderr)
+        # Full traceback only when debugging (VIGILO_DEBUG=1)
+        if os.environ.get("VIGILO_DEBUG"):
+            import traceback
+            traceback.print_exc()
+        else:
+            print("   Set VIGILO_DEBUG=1 for the full traceback", file=sys.stderr)
         sys.exit(1)
 
 
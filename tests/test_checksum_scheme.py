@@ -0,0 +1,75 @@
+import hashlib
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import file_monitoring
+from file_monitoring import MonitoredFile
+from FileWatcher import FileWatcher
+
+
+class _FakeBlake3:
+    """Stand-in for the optional blake3 package (BLAKE2b underneath)."""
+    
+    class blake3:
+        AUTO = -1
+        
+        def __init__(self, max_threads=None):
+            self._h = hashlib.blake2b()
+        
+        def update(self, data):
+            self._h.update(data)
+        
+        def hexdigest(self):
+            return self._h.hexdigest()
+
+
+class ChecksumSchemeTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "watched.txt")
+        with open(self.path, "w") as f:
+            f.write("unchanged content\n")
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_installing_blake3_keeps_sha256_baseline_comparable(self):
+        with mock.patch.object(file_monitoring, "blake3", None):
+            baseline = MonitoredFile(self.path).load_file_info()
+        self.assertNotIn(":", baseline["metadata"]["checksum"])
+        
+        # blake3 gets installed, then a chmod changes ctime (stat guard miss)
+        os.chmod(self.path, 0o600)
+        with mock.patch.object(file_monitoring, "blake3", _FakeBlake3):
+            current = MonitoredFile(self.path).load_file_info(prev=baseline["metadata"])
+        
+        self.assertNotEqual(current["metadata"]["ctime_ns"], baseline["metadata"]["ctime_ns"])
+        self.assertEqual(current["metadata"]["checksum"], baseline["metadata"]["checksum"])
+        self.assertNotIn("checksum", FileWatcher.compare_metadata(baseline, current))
+    
+    def test_changed_content_switches_to_blake3(self):
+        with mock.patch.object(file_monitoring, "blake3", None):
+            baseline = MonitoredFile(self.path).load_file_info()
+        
+        with open(self.path, "w") as f:
+            f.write("changed content, longer\n")
+        with mock.patch.object(file_monitoring, "blake3", _FakeBlake3):
+            current = MonitoredFile(self.path).load_file_info(prev=baseline["metadata"])
+        
+        self.assertTrue(current["metadata"]["checksum"].startswith("blake3:"))
+    
+    def test_cross_scheme_checksums_are_not_reported(self):
+        old = {"metadata": {"checksum": "ab" * 32, "size": 4}}
+        new = {"metadata": {"checksum": "blake3:" + "cd" * 32, "size": 4}}
+        
+        self.assertEqual(FileWatcher.compare_metadata(old, new), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+class CommandDispatchTest(unittest.TestCase):
+    
+    def test_shortcuts_match_parser_namespace(self):
+        parser = main._build_parser()
+        
+        for command, (func, defaults) in main._COMMAND_DISPATCH.items():
+            with self.subTest(command=command):
+                parsed = vars(parser.parse_args([command]))
+                shortcut = dict(defaults, command=command, func=func)
+                self.assertEqual(shortcut, parsed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FileWatcher import FileWatcher
+
+
+class CompareMetadataTest(unittest.TestCase):
+    
+    def test_keys_missing_from_old_baseline_are_not_reported(self):
+        old = {"metadata": {"size": 4, "checksum": "ab" * 32}}
+        new = {"metadata": {"size": 4, "checksum": "ab" * 32, "ino": 1234}}
+        
+        self.assertEqual(FileWatcher.compare_metadata(old, new), {})
+    
+    def test_inode_change_is_reported(self):
+        old = {"metadata": {"size": 4, "checksum": "ab" * 32, "ino": 1234}}
+        new = {"metadata": {"size": 4, "checksum": "ab" * 32, "ino": 5678}}
+        
+        self.assertEqual(
+            FileWatcher.compare_metadata(old, new),
+            {"ino": {"before": 1234, "after": 5678}}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_monitoring import _iso
+
+
+class IsoTimestampTest(unittest.TestCase):
+    """_iso must match datetime.fromtimestamp(ts).isoformat() exactly."""
+    
+    def assertMatchesIsoformat(self, timestamp):
+        self.assertEqual(_iso(timestamp), datetime.fromtimestamp(timestamp).isoformat())
+    
+    def test_ordinary_timestamp(self):
+        self.assertMatchesIsoformat(1700000000.123456)
+    
+    def test_whole_seconds_omit_microseconds(self):
+        self.assertMatchesIsoformat(1700000000.0)
+        self.assertNotIn(".", _iso(1700000000.0))
+    
+    def test_before_epoch(self):
+        self.assertMatchesIsoformat(-86400.5)
+        self.assertMatchesIsoformat(-1.25)
+
+
+if __name__ == "__main__":
+    unittest.main()